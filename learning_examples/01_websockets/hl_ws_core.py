@@ -0,0 +1,322 @@
+"""
+WebSocket示例脚本共享的核心组件。
+
+提供连接/订阅/接收循环、按通道分发的处理器、allMids价格处理以及周期性统计。
+各示例脚本继承BaseMidsMonitor，只覆盖需要定制的部分：
+- _should_track(symbol): 是否跟踪某个永续合约
+- _wire_key(symbol, index): allMids中该合约对应的键（去掉"@"前缀后）
+- _publish(updates): 如何输出一帧内的价格变化
+
+只关心少数币种时，订阅每个币种的bbo而不是allMids，由服务端完成过滤。
+"""
+
+import asyncio
+import functools
+import signal
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Coroutine, Dict, List, Optional, Tuple
+
+try:
+    import orjson
+except ImportError:
+    import json as orjson
+
+import websockets
+from hyperliquid.info import Info
+
+# 将learning_examples添加到路径以便导入共享模块
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from _cache import cache_key, load_cached, save_cached
+from _runtime import run as run_main
+
+# ---- 类型 ----
+
+JsonDict = Dict[str, Any]
+Handler = Callable[[JsonDict], None]
+PriceUpdate = Tuple[str, Optional[float], float]
+
+# ---- 常量 ----
+
+WS_CONNECT_OPTIONS: Dict[str, Any] = {
+    "compression": None,    # 小帧不值得zlib解压
+    "max_size": 2**22,
+    "max_queue": 1024,      # 容纳行情突发，避免读端过早进入背压
+    "ping_interval": 10,    # 更快发现断开的连接
+    "ping_timeout": 10,
+}
+STATS_INTERVAL = 30
+
+_DIRECTIONS = ("📉", "➡️", "📈")
+_FMT_CHANGE = "{} {}: ${:,.2f} ({:+.2f}%)".format
+_FMT_FIRST = "🔄 {}: ${:,.2f}".format
+_JSON_OBJECT_PREFIXES = ("{", b"{")
+
+
+def write_updates(updates: List[PriceUpdate]) -> None:
+    """格式化一批价格更新并一次性写入stdout"""
+    directions = _DIRECTIONS
+    fmt_change = _FMT_CHANGE
+    fmt_first = _FMT_FIRST
+    lines = []
+
+    for symbol, old_price, new_price in updates:
+        if old_price is None:
+            lines.append(fmt_first(symbol, new_price))
+            continue
+
+        change = new_price - old_price
+        change_pct = (change / old_price) * 100 if old_price != 0 else 0.0
+        direction = directions[(change > 0) - (change < 0) + 1]
+        lines.append(fmt_change(direction, symbol, new_price, change_pct))
+
+    lines.append("")
+    sys.stdout.write("\n".join(lines))
+
+
+@functools.lru_cache(maxsize=4)
+def get_meta(base_url: str) -> JsonDict:
+    """获取永续合约meta：进程内缓存，并在磁盘上缓存（见_cache.DISK_CACHE_TTL）"""
+    key = cache_key(base_url, "meta")
+    meta = load_cached(key)
+    if meta is None:
+        meta = Info(base_url, skip_ws=True).meta()
+        save_cached(key, meta)
+    return meta
+
+
+class BaseMidsMonitor:
+    """基于allMids的价格监控器基类"""
+
+    def __init__(self, ws_url: Optional[str], base_url: str) -> None:
+        self.ws_url = ws_url
+        self.base_url = base_url
+
+        # 状态：价格按合约在universe中的下标存放
+        self.all_perp_symbols: List[str] = []
+        self._track_idx: Dict[str, int] = {}
+        self._last_prices: List[Optional[float]] = []
+        self.update_count = 0
+
+        # 调度器
+        self.handlers: Dict[str, Handler] = {}
+        self.on("subscriptionResponse", self.handle_subscription_response)
+        self.on("allMids", self.handle_all_mids)
+        self.on("bbo", self.handle_bbo)
+
+        # 停止标志
+        self._running = True
+
+    @property
+    def prices(self) -> Dict[str, float]:
+        """已收到价格的合约的最新价格"""
+        return {
+            symbol: price
+            for symbol, price in zip(self.all_perp_symbols, self._last_prices)
+            if price is not None
+        }
+
+    # ---- 生命周期 ----
+
+    def stop(self) -> None:
+        self._running = False
+
+    def install_signal_handlers(self) -> None:
+        def _sigint_handler(signum, frame):
+            print("\n🛑 Shutting down...")
+            self.stop()
+
+        signal.signal(signal.SIGINT, _sigint_handler)
+
+    async def load_all_perp_symbols(self) -> None:
+        """从Hyperliquid API加载所有永续合约符号，并建立allMids键到下标的映射"""
+        meta = get_meta(self.base_url)
+
+        names = []
+        track_idx = {}
+        for i, asset_info in enumerate(meta["universe"]):
+            name = asset_info["name"]
+            names.append(name)
+            if self._should_track(name):
+                track_idx[self._wire_key(name, i)] = i
+
+        self.all_perp_symbols = names
+        self._track_idx = track_idx
+        self._last_prices = [None] * len(names)
+
+        print(f"✅ Loaded {len(names)} perpetual contracts")
+
+    # ---- 可覆盖的钩子 ----
+
+    def _should_track(self, symbol: str) -> bool:
+        return True
+
+    def _wire_key(self, symbol: str, index: int) -> str:
+        return symbol
+
+    def _publish(self, updates: List[PriceUpdate]) -> None:
+        write_updates(updates)
+
+    def _background_tasks(self) -> List[Coroutine[Any, Any, None]]:
+        return []
+
+    def _on_shutdown(self) -> None:
+        pass
+
+    # ---- 订阅辅助方法 ----
+
+    async def send_subscribe(self, websocket, subscription: JsonDict) -> None:
+        msg = {"method": "subscribe", "subscription": subscription}
+        await websocket.send(orjson.dumps(msg), text=True)
+
+    async def send_unsubscribe(self, websocket, subscription: JsonDict) -> None:
+        msg = {"method": "unsubscribe", "subscription": subscription}
+        await websocket.send(orjson.dumps(msg), text=True)
+
+    # ---- 处理器注册 ----
+
+    def on(self, channel: str, handler: Handler) -> None:
+        """为给定的传入消息通道注册处理器。处理器必须是同步函数，在接收循环中直接调用。"""
+        self.handlers[channel] = handler
+
+    def dispatch(self, data: JsonDict) -> None:
+        handler = self.handlers.get(data.get("channel"))
+        if handler:
+            handler(data)
+
+    # ---- 处理器 ----
+
+    def handle_subscription_response(self, data: JsonDict) -> None:
+        print(f"✅ Subscription confirmed: {data.get('data')}")
+
+    def handle_all_mids(self, data: JsonDict) -> None:
+        try:
+            mids = data["data"]["mids"]
+        except (KeyError, TypeError):
+            return
+
+        self.process_mids(mids)
+
+    def handle_bbo(self, data: JsonDict) -> None:
+        """单币种bbo订阅：用最优买卖价的中间价更新价格"""
+        try:
+            book = data["data"]
+            bid, ask = book["bbo"]
+            mid = (float(bid["px"]) + float(ask["px"])) / 2
+        except (KeyError, TypeError, ValueError):
+            return
+
+        self.process_mids({book["coin"]: mid})
+
+    def process_mids(self, mids: Dict[str, str]) -> None:
+        """更新跟踪合约的价格，并把本帧的变化交给_publish"""
+        names = self.all_perp_symbols
+        last_prices = self._last_prices
+        idx_get = self._track_idx.get
+        updates = []
+
+        for k, price_str in mids.items():
+            i = idx_get(k[1:] if k[:1] == "@" else k)
+            if i is None:
+                continue
+
+            try:
+                new_price = float(price_str)
+            except (ValueError, TypeError):
+                continue
+
+            updates.append((names[i], last_prices[i], new_price))
+            last_prices[i] = new_price
+
+        if updates:
+            self.update_count += len(updates)
+            self._publish(updates)
+
+    async def display_statistics(self) -> None:
+        """每30秒显示周期性统计信息"""
+        while self._running:
+            await asyncio.sleep(STATS_INTERVAL)
+
+            if not self._running:
+                break
+
+            timestamp = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime())
+            active_count = len(self.prices)
+
+            print("\n" + "=" * 60)
+            print(f"📊 Statistics ({timestamp})")
+            print(f"   Monitored: {len(self._track_idx)} perpetuals")
+            print(f"   Updates received: {self.update_count:,}")
+            print(f"   Active assets: {active_count}")
+            print("=" * 60 + "\n")
+
+    # ---- 主循环 ----
+
+    async def run(self, subscriptions: Optional[List[JsonDict]] = None) -> None:
+        if subscriptions is None:
+            subscriptions = [{"type": "allMids"}]
+
+        print("🔗 Loading all perpetual contract symbols...")
+        await self.load_all_perp_symbols()
+
+        print(f"🔗 Connecting to {self.ws_url}")
+        self.install_signal_handlers()
+
+        tasks = [asyncio.create_task(coro) for coro in self._background_tasks()]
+
+        try:
+            async with websockets.connect(self.ws_url, **WS_CONNECT_OPTIONS) as websocket:
+                print("✅ WebSocket connected!")
+
+                # 服务端每条消息只接受一个订阅，并发发送避免逐个等待
+                await asyncio.gather(
+                    *(self.send_subscribe(websocket, sub) for sub in subscriptions)
+                )
+
+                print("📡 Subscribed to:")
+                for sub in subscriptions:
+                    print(f"  - {sub}")
+                print("=" * 60)
+
+                await self._receive(websocket)
+
+        except websockets.exceptions.ConnectionClosed:
+            print("🔌 WebSocket connection closed")
+        except Exception as e:
+            print(f"❌ WebSocket error: {e}")
+        finally:
+            self._running = False
+            for task in tasks:
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+            self._on_shutdown()
+            print("👋 Disconnected")
+
+    async def _receive(self, websocket) -> None:
+        dispatch = self.dispatch
+
+        async for message in websocket:
+            if not self._running:
+                break
+
+            # 非JSON对象的帧直接跳过，避免进入解析异常路径
+            if message[:1] not in _JSON_OBJECT_PREFIXES:
+                print("⚠️ Received invalid JSON")
+                continue
+
+            # orjson解析期间持有GIL，放到线程池也不会让出事件循环，只会多一次线程切换；直接内联解析
+            try:
+                payload = orjson.loads(message)
+            except orjson.JSONDecodeError:
+                print("⚠️ Received invalid JSON")
+                continue
+
+            try:
+                dispatch(payload)
+            except Exception as e:
+                print(f"❌ Handler error: {e}")
@@ -5,12 +5,13 @@
 
 import asyncio
 import os
-from datetime import datetime
-from typing import Any, Dict
+from typing import Any, Optional
 
 from dotenv import load_dotenv
 from hyperliquid.info import Info
 
+from hl_ws_core import BaseMidsMonitor, run_main
+
 load_dotenv()
 
 BASE_URL = os.getenv(
@@ -19,86 +20,27 @@ BASE_URL = os.getenv(
 )
 
 
-class SDKPerpetualsMonitor:
+class SDKPerpetualsMonitor(BaseMidsMonitor):
     """使用官方SDK WebSocket监控所有永续合约"""
 
     def __init__(self, base_url: str):
-        self.base_url = base_url
-        self.prices: Dict[str, float] = {}
-        self.all_perp_symbols: list = []
-        self._running = True
-        self.update_count = 0
-        self.info: Info = None
-
-    def load_all_perp_symbols(self) -> None:
-        """加载所有永续合约符号"""
-        temp_info = Info(self.base_url, skip_ws=True)
-        meta = temp_info.meta()
-
-        self.all_perp_symbols = [
-            asset_info["name"] for asset_info in meta["universe"]
-        ]
-
-        print(f"✅ Loaded {len(self.all_perp_symbols)} perpetual contracts")
+        super().__init__(ws_url=None, base_url=base_url)
+        self.info: Optional[Info] = None
 
     def handle_price_update(self, data: Any) -> None:
-        """从SDK WebSocket接收价格更新的回调"""
-        if not isinstance(data, dict):
-            return
-
-        mids = data.get("data", {}).get("mids", {})
-        if not mids:
+        """从SDK WebSocket接收价格更新的回调（在SDK的WebSocket线程中执行）"""
+        try:
+            mids = data["data"]["mids"]
+        except (KeyError, TypeError):
             return
 
-        for k, price_str in mids.items():
-            symbol = k.lstrip("@") if isinstance(k, str) and k.startswith("@") else k
-
-            if symbol not in self.all_perp_symbols:
-                continue
-
-            try:
-                new_price = float(price_str)
-                old_price = self.prices.get(symbol)
-                self.prices[symbol] = new_price
-                self.update_count += 1
-
-                if old_price is not None:
-                    change = new_price - old_price
-                    change_pct = (change / old_price) * 100 if old_price != 0 else 0.0
-                    direction = "📈" if change > 0 else "📉" if change < 0 else "➡️"
-                    print(f"{direction} {symbol}: ${new_price:,.2f} ({change_pct:+.2f}%)")
-                else:
-                    print(f"🔄 {symbol}: ${new_price:,.2f}")
-
-            except (ValueError, TypeError):
-                continue
-
-    async def display_statistics(self) -> None:
-        """每30秒显示周期性统计信息"""
-        while self._running:
-            await asyncio.sleep(30)
-
-            if not self._running:
-                break
-
-            timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            active_count = len(self.prices)
-
-            print("\n" + "=" * 60)
-            print(f"📊 Statistics ({timestamp})")
-            print(f"   Monitored: {len(self.all_perp_symbols)} perpetuals")
-            print(f"   Updates received: {self.update_count:,}")
-            print(f"   Active assets: {active_count}")
-            print("=" * 60 + "\n")
+        if mids:
+            self.process_mids(mids)
 
     async def run(self) -> None:
         """使用SDK WebSocket的主运行循环"""
-        print("Hyperliquid - All Perpetuals Monitor (SDK Version)")
-        print("=" * 60)
-        print(f"🔗 Using API: {self.base_url}")
-
         print("🔗 Loading all perpetual contract symbols...")
-        self.load_all_perp_symbols()
+        await self.load_all_perp_symbols()
 
         print("🔗 Initializing SDK WebSocket connection...")
         self.info = Info(self.base_url, skip_ws=False)
@@ -136,12 +78,16 @@ class SDKPerpetualsMonitor:
 
 async def main():
     """主入口点"""
+    print("Hyperliquid - All Perpetuals Monitor (SDK Version)")
+    print("=" * 60)
+    print(f"🔗 Using API: {BASE_URL}")
+
     monitor = SDKPerpetualsMonitor(base_url=BASE_URL)
     await monitor.run()
 
 
 if __name__ == "__main__":
     try:
-        asyncio.run(main())
+        run_main(main())
     except KeyboardInterrupt:
         print("\n👋 Goodbye!")
@@ -5,12 +5,23 @@
 
 import asyncio
 import os
+import sys
+from pathlib import Path
 from typing import Dict, Optional
 
+try:
+    import orjson
+except ImportError:
+    import json as orjson
+
 from dotenv import load_dotenv
-import httpx
 from hyperliquid.info import Info
 
+# 将learning_examples添加到路径以便导入共享模块
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from _runtime import close_client, get_client, run
+
 load_dotenv()
 
 # 你只能在官方Hyperliquid公共API上使用此端点。
@@ -21,76 +32,79 @@ ASSETS_TO_SHOW = ["BTC", "ETH", "SOL", "DOGE", "AVAX"]
 
 async def method_1_sdk() -> Optional[Dict[str, str]]:
     """方法1：使用Hyperliquid Python SDK"""
-    print("Method 1: Hyperliquid SDK")
-    print("-" * 30)
+    lines = ["Method 1: Hyperliquid SDK", "-" * 30]
 
     try:
-        info = Info(BASE_URL, skip_ws=True)
-        all_prices = info.all_mids()
+        info = await asyncio.to_thread(Info, BASE_URL, skip_ws=True)
+        all_prices = await asyncio.to_thread(info.all_mids)
 
-        print(f"Got prices for {len(all_prices)} assets")
+        lines.append(f"Got prices for {len(all_prices)} assets")
         for asset in ASSETS_TO_SHOW:
             if asset in all_prices:
                 price = float(all_prices[asset])
-                print(f"   {asset}: ${price:,.2f}")
+                lines.append(f"   {asset}: ${price:,.2f}")
 
         return all_prices
 
     except Exception as e:
-        print(f"SDK method failed: {e}")
+        lines.append(f"SDK method failed: {e}")
         return None
 
+    finally:
+        print("\n".join(lines))
+
 
 async def method_2_raw_api() -> Optional[Dict[str, str]]:
     """方法2：原始HTTP API调用"""
-    print("\nMethod 2: Raw HTTP API")
-    print("-" * 30)
+    lines = ["\nMethod 2: Raw HTTP API", "-" * 30]
 
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{BASE_URL}/info",
-                json={"type": "allMids"},
-                headers={"Content-Type": "application/json"},
-            )
-
-            if response.status_code == 200:
-                all_prices = response.json()
-                print(f"Got prices for {len(all_prices)} assets")
-
-                for asset in ASSETS_TO_SHOW:
-                    if asset in all_prices:
-                        price = float(all_prices[asset])
-                        print(f"   {asset}: ${price:,.2f}")
-
-                return all_prices
-            else:
-                print(f"HTTP failed: {response.status_code}")
-                return None
+        response = await get_client().post(
+            f"{BASE_URL}/info",
+            content=orjson.dumps({"type": "allMids"}),
+            headers={"Content-Type": "application/json"},
+        )
+
+        response.raise_for_status()
+        all_prices = orjson.loads(response.content)
+        lines.append(f"Got prices for {len(all_prices)} assets")
+
+        for asset in ASSETS_TO_SHOW:
+            if asset in all_prices:
+                price = float(all_prices[asset])
+                lines.append(f"   {asset}: ${price:,.2f}")
+
+        return all_prices
 
     except Exception as e:
-        print(f"HTTP method failed: {e}")
+        lines.append(f"HTTP method failed: {e}")
         return None
 
+    finally:
+        print("\n".join(lines))
 
-async def main() -> None:
-    print("Hyperliquid Market Prices")
-    print("=" * 40)
 
-    sdk_prices = await method_1_sdk()
-    http_prices = await method_2_raw_api()
-
-    if sdk_prices and http_prices:
-        print("\nComparison:")
-        for asset in ["BTC", "ETH", "SOL"]:
-            if asset in sdk_prices and asset in http_prices:
-                sdk_price = float(sdk_prices[asset])
-                http_price = float(http_prices[asset])
-                match = "MATCH" if sdk_price == http_price else "DIFF"
-                print(
-                    f"   {asset}: SDK=${sdk_price:,.2f} | HTTP=${http_price:,.2f} {match}"
-                )
+async def main() -> None:
+    try:
+        print("Hyperliquid Market Prices")
+        print("=" * 40)
+
+        # 两种方法相互独立，并发执行
+        sdk_prices, http_prices = await asyncio.gather(method_1_sdk(), method_2_raw_api())
+
+        if sdk_prices and http_prices:
+            print("\nComparison:")
+            for asset in ["BTC", "ETH", "SOL"]:
+                if asset in sdk_prices and asset in http_prices:
+                    sdk_price = float(sdk_prices[asset])
+                    http_price = float(http_prices[asset])
+                    match = "MATCH" if sdk_price == http_price else "DIFF"
+                    print(
+                        f"   {asset}: SDK=${sdk_price:,.2f} | HTTP=${http_price:,.2f} {match}"
+                    )
+    finally:
+        await close_client()
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    run(main())
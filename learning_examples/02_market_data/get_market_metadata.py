@@ -5,126 +5,155 @@
 
 import asyncio
 import os
+import sys
+from pathlib import Path
+from typing import Dict, Optional
+
+try:
+    import orjson
+except ImportError:
+    import json as orjson
+
 from dotenv import load_dotenv
-import httpx
 from hyperliquid.info import Info
 
+# 将learning_examples添加到路径以便导入共享模块
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from _cache import cache_key, cached, load_cached, save_cached
+from _runtime import close_client, get_client, run
+
 load_dotenv()
 
 BASE_URL = os.getenv("HYPERLIQUID_CHAINSTACK_BASE_URL")
 ASSETS_TO_ANALYZE = ["BTC", "ETH", "SOL"]
+META_TTL = 60  # meta很少变化，进程内缓存60秒
+POW10 = tuple(10.0**i for i in range(12))  # 小数位数只有少数几种取值，预先算好10的幂
+
+
+async def fetch_meta() -> Dict:
+    """通过原始HTTP API获取meta（进程内缓存 + 磁盘缓存）"""
+
+    async def _fetch() -> Dict:
+        key = cache_key(BASE_URL, "meta")
+        meta = load_cached(key)
+        if meta is not None:
+            return meta
+
+        response = await get_client().post(
+            f"{BASE_URL}/info",
+            content=orjson.dumps({"type": "meta"}),
+            headers={"Content-Type": "application/json"},
+        )
+        response.raise_for_status()
+        meta = orjson.loads(response.content)
+        save_cached(key, meta)
+        return meta
+
+    return await cached("meta", META_TTL, _fetch)
 
 
 async def method_1_sdk():
     """方法1：使用Hyperliquid Python SDK"""
-    print("Method 1: Hyperliquid SDK")
-    print("-" * 30)
+    lines = ["Method 1: Hyperliquid SDK", "-" * 30]
 
     try:
-        info = Info(BASE_URL, skip_ws=True)
-        meta = info.meta()
+        info = await asyncio.to_thread(Info, BASE_URL, skip_ws=True)
+        meta = await asyncio.to_thread(info.meta)
         universe = meta.get("universe", [])
 
-        print(f"Found {len(universe)} trading pairs")
+        lines.append(f"Found {len(universe)} trading pairs")
 
         for asset_info in universe:
             asset_name = asset_info.get("name", "")
             if asset_name in ASSETS_TO_ANALYZE:
-                print(f"\n{asset_name}:")
-                print(f"   Size decimals: {asset_info.get('szDecimals')}")
-                print(f"   Price decimals: {asset_info.get('priceDecimals')}")
-                print(f"   Max leverage: {asset_info.get('maxLeverage')}x")
-                print(f"   Only isolated: {asset_info.get('onlyIsolated', False)}")
+                lines.append(f"\n{asset_name}:")
+                lines.append(f"   Size decimals: {asset_info.get('szDecimals')}")
+                lines.append(f"   Price decimals: {asset_info.get('priceDecimals')}")
+                lines.append(f"   Max leverage: {asset_info.get('maxLeverage')}x")
+                lines.append(f"   Only isolated: {asset_info.get('onlyIsolated', False)}")
 
         return meta
 
     except Exception as e:
-        print(f"SDK method failed: {e}")
+        lines.append(f"SDK method failed: {e}")
         return None
 
+    finally:
+        print("\n".join(lines))
+
 
 async def method_2_raw_api():
     """方法2：原始HTTP API调用"""
-    print("\nMethod 2: Raw HTTP API")
-    print("-" * 30)
+    lines = ["\nMethod 2: Raw HTTP API", "-" * 30]
 
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{BASE_URL}/info",
-                json={"type": "meta"},
-                headers={"Content-Type": "application/json"},
-            )
-
-            if response.status_code == 200:
-                meta = response.json()
-                universe = meta.get("universe", [])
-
-                print(f"Found {len(universe)} trading pairs")
-
-                for asset_info in universe:
-                    asset_name = asset_info.get("name", "")
-                    if asset_name in ASSETS_TO_ANALYZE:
-                        print(f"\n{asset_name}:")
-                        print(f"   Size decimals: {asset_info.get('szDecimals')}")
-                        print(f"   Price decimals: {asset_info.get('priceDecimals')}")
-                        print(f"   Max leverage: {asset_info.get('maxLeverage')}x")
-                        print(
-                            f"   Only isolated: {asset_info.get('onlyIsolated', False)}"
-                        )
-
-                return meta
-            else:
-                print(f"HTTP failed: {response.status_code}")
-                return None
+        meta = await fetch_meta()
+        universe = meta.get("universe", [])
+
+        lines.append(f"Found {len(universe)} trading pairs")
+
+        for asset_info in universe:
+            asset_name = asset_info.get("name", "")
+            if asset_name in ASSETS_TO_ANALYZE:
+                lines.append(f"\n{asset_name}:")
+                lines.append(f"   Size decimals: {asset_info.get('szDecimals')}")
+                lines.append(f"   Price decimals: {asset_info.get('priceDecimals')}")
+                lines.append(f"   Max leverage: {asset_info.get('maxLeverage')}x")
+                lines.append(
+                    f"   Only isolated: {asset_info.get('onlyIsolated', False)}"
+                )
+
+        return meta
 
     except Exception as e:
-        print(f"HTTP method failed: {e}")
+        lines.append(f"HTTP method failed: {e}")
         return None
 
+    finally:
+        print("\n".join(lines))
+
 
-async def calculate_trading_constraints():
-    """计算最小大小和价格刻度"""
-    print("\nTrading Constraints")
-    print("-" * 25)
+async def calculate_trading_constraints(meta: Optional[Dict] = None):
+    """计算最小大小和价格刻度；未传入meta时从缓存/API获取"""
+    lines = ["\nTrading Constraints", "-" * 25]
 
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{BASE_URL}/info",
-                json={"type": "meta"},
-                headers={"Content-Type": "application/json"},
-            )
-
-            if response.status_code == 200:
-                meta = response.json()
-                universe = meta.get("universe", [])
-
-                for asset_info in universe[:3]:
-                    name = asset_info.get("name", "")
-                    sz_decimals = asset_info.get("szDecimals", 4)
-                    price_decimals = asset_info.get("priceDecimals", 2)
-
-                    min_size = 1 / (10**sz_decimals)
-                    price_tick = 1 / (10**price_decimals)
-
-                    print(f"\n{name}:")
-                    print(f"   Min order size: {min_size:.{sz_decimals}f} {name}")
-                    print(f"   Price tick size: ${price_tick:.{price_decimals}f}")
-                    print(f"   Max leverage: {asset_info.get('maxLeverage')}x")
+        if meta is None:
+            meta = await fetch_meta()
+        universe = meta.get("universe", [])
+
+        for asset_info in universe[:3]:
+            name = asset_info.get("name", "")
+            sz_decimals = asset_info.get("szDecimals", 4)
+            price_decimals = asset_info.get("priceDecimals", 2)
+
+            min_size = 1.0 / POW10[sz_decimals]
+            price_tick = 1.0 / POW10[price_decimals]
+
+            lines.append(f"\n{name}:")
+            lines.append(f"   Min order size: {min_size:.{sz_decimals}f} {name}")
+            lines.append(f"   Price tick size: ${price_tick:.{price_decimals}f}")
+            lines.append(f"   Max leverage: {asset_info.get('maxLeverage')}x")
 
     except Exception as e:
-        print(f"Analysis failed: {e}")
+        lines.append(f"Analysis failed: {e}")
+
+    finally:
+        print("\n".join(lines))
 
 
 async def main():
-    print("Hyperliquid Market Metadata")
-    print("=" * 40)
+    try:
+        print("Hyperliquid Market Metadata")
+        print("=" * 40)
 
-    await method_1_sdk()
-    await method_2_raw_api()
-    await calculate_trading_constraints()
+        # 两种方法并发执行；约束计算随后复用方法2缓存的meta
+        await asyncio.gather(method_1_sdk(), method_2_raw_api())
+        await calculate_trading_constraints()
+    finally:
+        await close_client()
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    run(main())
@@ -0,0 +1,106 @@
+"""
+通过WebSocket订阅allMids，在内存中维护所有资产的最新中间价。
+读取价格时直接查内存字典；字典为空或超过MAX_AGE秒未更新时回退到REST请求。
+"""
+
+import asyncio
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from dotenv import load_dotenv
+from hyperliquid.info import Info
+
+# 将learning_examples添加到路径以便导入共享模块
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from _runtime import run
+
+load_dotenv()
+
+# 你只能在官方Hyperliquid公共API上使用此端点。
+# Chainstack不可用，因为开源节点实现尚不支持它。
+BASE_URL = os.getenv("HYPERLIQUID_TESTNET_PUBLIC_BASE_URL")
+ASSETS_TO_SHOW = ["BTC", "ETH", "SOL", "DOGE", "AVAX"]
+MAX_AGE = 5.0  # 推送超过5秒未更新则认为过期，回退到REST
+FIRST_UPDATE_TIMEOUT = 5.0
+
+
+class PriceStream:
+    """由allMids订阅持续填充的 资产 -> 中间价 映射"""
+
+    def __init__(self, base_url: str, max_age: float = MAX_AGE) -> None:
+        self.base_url = base_url
+        self.max_age = max_age
+        self.info: Optional[Info] = None
+        self._mids: Dict[str, str] = {}
+        self._updated_at = 0.0
+        self._first_update = threading.Event()
+
+    def _on_mids(self, msg: Any) -> None:
+        """SDK WebSocket线程中的回调：整体替换字典引用，读取方无需加锁"""
+        try:
+            mids = msg["data"]["mids"]
+        except (KeyError, TypeError):
+            return
+
+        self._mids = mids
+        self._updated_at = time.monotonic()
+        self._first_update.set()
+
+    async def start(self, timeout: float = FIRST_UPDATE_TIMEOUT) -> bool:
+        """建立WebSocket并订阅allMids，等待第一帧推送；返回是否在超时前收到"""
+        self.info = await asyncio.to_thread(Info, self.base_url, skip_ws=False)
+        self.info.subscribe({"type": "allMids"}, self._on_mids)
+        return await asyncio.to_thread(self._first_update.wait, timeout)
+
+    def stop(self) -> None:
+        if self.info is not None:
+            self.info.disconnect_websocket()
+            self.info = None
+
+    def is_fresh(self) -> bool:
+        return bool(self._mids) and time.monotonic() - self._updated_at <= self.max_age
+
+    async def get_mids(self) -> Dict[str, str]:
+        """返回所有中间价：推送数据新鲜时直接读内存，否则回退到REST"""
+        if self.is_fresh():
+            return self._mids
+
+        info = self.info
+        if info is None:
+            info = await asyncio.to_thread(Info, self.base_url, skip_ws=True)
+        return await asyncio.to_thread(info.all_mids)
+
+    async def get_price(self, symbol: str) -> Optional[float]:
+        price = (await self.get_mids()).get(symbol)
+        return float(price) if price is not None else None
+
+
+async def main() -> None:
+    print("Hyperliquid Price Stream")
+    print("=" * 40)
+
+    stream = PriceStream(BASE_URL)
+    try:
+        if not await stream.start():
+            print("⚠️ No allMids push yet, reads will fall back to REST")
+
+        for _ in range(3):
+            mids = await stream.get_mids()
+            source = "stream" if stream.is_fresh() else "REST"
+            lines = [f"\nGot prices for {len(mids)} assets ({source})"]
+            for asset in ASSETS_TO_SHOW:
+                if asset in mids:
+                    lines.append(f"   {asset}: ${float(mids[asset]):,.2f}")
+            print("\n".join(lines))
+            await asyncio.sleep(1)
+    finally:
+        stream.stop()
+
+
+if __name__ == "__main__":
+    run(main())
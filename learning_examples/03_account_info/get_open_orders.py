@@ -4,11 +4,22 @@
 
 import asyncio
 import os
+import sys
+from pathlib import Path
+
+try:
+    import orjson
+except ImportError:
+    import json as orjson
 
-import httpx
 from dotenv import load_dotenv
 from hyperliquid.info import Info
 
+# 将learning_examples添加到路径以便导入共享模块
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from _runtime import close_client, get_client, run
+
 load_dotenv()
 
 # 你只能在官方Hyperliquid公共API上使用此端点。
@@ -19,14 +30,13 @@ WALLET_ADDRESS = os.getenv("TESTNET_WALLET_ADDRESS")
 
 async def method_1_sdk():
     """方法1：使用Hyperliquid Python SDK"""
-    print("Method 1: Hyperliquid SDK")
-    print("-" * 30)
+    lines = ["Method 1: Hyperliquid SDK", "-" * 30]
 
     try:
-        info = Info(BASE_URL, skip_ws=True)
-        open_orders = info.open_orders(WALLET_ADDRESS)
+        info = await asyncio.to_thread(Info, BASE_URL, skip_ws=True)
+        open_orders = await asyncio.to_thread(info.open_orders, WALLET_ADDRESS)
 
-        print(f"Found {len(open_orders)} open orders")
+        lines.append(f"Found {len(open_orders)} open orders")
 
         if open_orders:
             for order in open_orders:
@@ -34,76 +44,81 @@ async def method_1_sdk():
                 coin = order.get("coin", "")
                 side = "BUY" if order.get("side") == "B" else "SELL"
                 size = order.get("sz", "0")
-                limit_px = order.get("limitPx", "0")
+                px = float(order.get("limitPx", "0"))
                 timestamp = order.get("timestamp", 0)
 
-                order_value = float(size) * float(limit_px)
-                print(f"\nOrder {oid}:")
-                print(f"   {side} {size} {coin} @ ${float(limit_px):,.2f}")
-                print(f"   Total value: ${order_value:,.2f}")
-                print(f"   Timestamp: {timestamp}")
+                order_value = float(size) * px
+                lines.append(f"\nOrder {oid}:")
+                lines.append(f"   {side} {size} {coin} @ ${px:,.2f}")
+                lines.append(f"   Total value: ${order_value:,.2f}")
+                lines.append(f"   Timestamp: {timestamp}")
         else:
-            print("No open orders")
+            lines.append("No open orders")
 
         return open_orders
 
     except Exception as e:
-        print(f"SDK method failed: {e}")
+        lines.append(f"SDK method failed: {e}")
         return None
 
+    finally:
+        print("\n".join(lines))
+
 
 async def method_2_raw_api():
     """方法2：原始HTTP API调用"""
-    print("\nMethod 2: Raw HTTP API")
-    print("-" * 30)
+    lines = ["\nMethod 2: Raw HTTP API", "-" * 30]
 
     private_key = os.getenv("HYPERLIQUID_TESTNET_PRIVATE_KEY")
     if not private_key:
-        print("Set HYPERLIQUID_TESTNET_PRIVATE_KEY in your .env file")
-        print("Create .env file with: HYPERLIQUID_TESTNET_PRIVATE_KEY=0x...")
+        lines.append("Set HYPERLIQUID_TESTNET_PRIVATE_KEY in your .env file")
+        lines.append("Create .env file with: HYPERLIQUID_TESTNET_PRIVATE_KEY=0x...")
+        print("\n".join(lines))
         return None
 
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{BASE_URL}/info",
-                json={"type": "openOrders", "user": WALLET_ADDRESS},
-                headers={"Content-Type": "application/json"},
-            )
-
-            if response.status_code == 200:
-                open_orders = response.json()
-
-                print(f"Found {len(open_orders)} open orders")
-
-                if open_orders:
-                    for order in open_orders:
-                        oid = order.get("oid", "")
-                        coin = order.get("coin", "")
-                        side = "BUY" if order.get("side") == "B" else "SELL"
-                        size = order.get("sz", "0")
-                        limit_px = order.get("limitPx", "0")
-
-                        print(f"\nOrder {oid}:")
-                        print(f"   {side} {size} {coin} @ ${float(limit_px):,.2f}")
-
-                return open_orders
-            else:
-                print(f"HTTP failed: {response.status_code}")
-                return None
+        response = await get_client().post(
+            f"{BASE_URL}/info",
+            content=orjson.dumps({"type": "openOrders", "user": WALLET_ADDRESS}),
+            headers={"Content-Type": "application/json"},
+        )
+
+        response.raise_for_status()
+        open_orders = orjson.loads(response.content)
+
+        lines.append(f"Found {len(open_orders)} open orders")
+
+        if open_orders:
+            for order in open_orders:
+                oid = order.get("oid", "")
+                coin = order.get("coin", "")
+                side = "BUY" if order.get("side") == "B" else "SELL"
+                size = order.get("sz", "0")
+                limit_px = order.get("limitPx", "0")
+
+                lines.append(f"\nOrder {oid}:")
+                lines.append(f"   {side} {size} {coin} @ ${float(limit_px):,.2f}")
+
+        return open_orders
 
     except Exception as e:
-        print(f"HTTP method failed: {e}")
+        lines.append(f"HTTP method failed: {e}")
         return None
 
+    finally:
+        print("\n".join(lines))
+
 
 async def main():
-    print("Hyperliquid Open Orders")
-    print("=" * 40)
+    try:
+        print("Hyperliquid Open Orders")
+        print("=" * 40)
 
-    await method_1_sdk()
-    await method_2_raw_api()
+        # 两种方法相互独立，并发执行
+        await asyncio.gather(method_1_sdk(), method_2_raw_api())
+    finally:
+        await close_client()
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    run(main())
@@ -4,13 +4,24 @@
 
 import asyncio
 import os
+import sys
+from pathlib import Path
 from typing import Optional
 
-import httpx
+try:
+    import orjson
+except ImportError:
+    import json as orjson
+
 from dotenv import load_dotenv
 from eth_account import Account
 from hyperliquid.info import Info
 
+# 将learning_examples添加到路径以便导入共享模块
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from _runtime import close_client, get_client, run
+
 load_dotenv()
 
 BASE_URL = os.getenv("HYPERLIQUID_CHAINSTACK_BASE_URL")
@@ -19,77 +30,80 @@ WALLET_ADDRESS = os.getenv("TESTNET_WALLET_ADDRESS")
 
 async def method_1_sdk() -> Optional[Account]:
     """方法1：使用Hyperliquid Python SDK"""
-    print("Method 1: Hyperliquid SDK")
-    print("-" * 30)
+    lines = ["Method 1: Hyperliquid SDK", "-" * 30]
 
     try:
-        print("Connecting to Hyperliquid testnet...")
-        info = Info(BASE_URL, skip_ws=True)
+        lines.append("Connecting to Hyperliquid testnet...")
+        info = await asyncio.to_thread(Info, BASE_URL, skip_ws=True)
 
-        user_state = info.user_state(WALLET_ADDRESS)
-        print("Connection successful! API responded with account data")
+        user_state = await asyncio.to_thread(info.user_state, WALLET_ADDRESS)
+        lines.append("Connection successful! API responded with account data")
 
         margin_summary = user_state.get("marginSummary", {})
         account_value = float(margin_summary.get("accountValue", 0))
         withdrawable = float(user_state.get("withdrawable", 0))
         total_margin_used = float(margin_summary.get("totalMarginUsed", 0))
 
-        print(f"Account value: ${account_value:,.2f}")
-        print(f"Withdrawable: ${withdrawable:,.2f}")
-        print(f"Margin used: ${total_margin_used:,.2f}")
+        lines.append(f"Account value: ${account_value:,.2f}")
+        lines.append(f"Withdrawable: ${withdrawable:,.2f}")
+        lines.append(f"Margin used: ${total_margin_used:,.2f}")
 
         return user_state
 
     except Exception as e:
-        print(f"Connection failed: {e}")
+        lines.append(f"Connection failed: {e}")
         return None
 
+    finally:
+        print("\n".join(lines))
+
 
 async def method_2_raw_api() -> Optional[Account]:
     """方法2：原始HTTP API调用"""
-    print("\nMethod 2: Raw HTTP API")
-    print("-" * 30)
+    lines = ["\nMethod 2: Raw HTTP API", "-" * 30]
 
     try:
-        print("Making direct HTTP request to Hyperliquid API...")
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{BASE_URL}/info",
-                json={"type": "clearinghouseState", "user": WALLET_ADDRESS},
-                headers={"Content-Type": "application/json"},
-            )
-
-            if response.status_code == 200:
-                print("Connection successful! HTTP API responded")
-                user_state = response.json()
-
-                margin_summary = user_state.get("marginSummary", {})
-                account_value = float(margin_summary.get("accountValue", 0))
-                withdrawable = float(user_state.get("withdrawable", 0))
-                cross_margin_used = float(
-                    user_state.get("crossMaintenanceMarginUsed", 0)
-                )
-
-                print(f"Account value: ${account_value:,.2f}")
-                print(f"Withdrawable: ${withdrawable:,.2f}")
-                print(f"Margin used: ${cross_margin_used:,.2f}")
-                return user_state
-            else:
-                print(f"Connection failed: HTTP {response.status_code}")
-                return None
+        lines.append("Making direct HTTP request to Hyperliquid API...")
+        response = await get_client().post(
+            f"{BASE_URL}/info",
+            content=orjson.dumps({"type": "clearinghouseState", "user": WALLET_ADDRESS}),
+            headers={"Content-Type": "application/json"},
+        )
+
+        response.raise_for_status()
+        lines.append("Connection successful! HTTP API responded")
+        user_state = orjson.loads(response.content)
+
+        margin_summary = user_state.get("marginSummary", {})
+        account_value = float(margin_summary.get("accountValue", 0))
+        withdrawable = float(user_state.get("withdrawable", 0))
+        cross_margin_used = float(
+            user_state.get("crossMaintenanceMarginUsed", 0)
+        )
+
+        lines.append(f"Account value: ${account_value:,.2f}")
+        lines.append(f"Withdrawable: ${withdrawable:,.2f}")
+        lines.append(f"Margin used: ${cross_margin_used:,.2f}")
+        return user_state
 
     except Exception as e:
-        print(f"Connection failed: {e}")
+        lines.append(f"Connection failed: {e}")
         return None
 
+    finally:
+        print("\n".join(lines))
+
 
 async def main() -> None:
-    print("Hyperliquid Connection Methods")
-    print("=" * 40)
+    try:
+        print("Hyperliquid Connection Methods")
+        print("=" * 40)
 
-    await method_1_sdk()
-    await method_2_raw_api()
+        # 两种方法相互独立，并发执行
+        await asyncio.gather(method_1_sdk(), method_2_raw_api())
+    finally:
+        await close_client()
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    run(main())
@@ -4,18 +4,26 @@
 """
 
 import asyncio
-import json
 import os
+import sys
+from pathlib import Path
+from typing import Optional
 
 from dotenv import load_dotenv
 from eth_account import Account
 from hyperliquid.exchange import Exchange
 from hyperliquid.info import Info
 
+# 将learning_examples添加到路径以便导入共享模块
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from _runtime import run, to_pretty_json
+
 load_dotenv()
 
 BASE_URL = os.getenv("HYPERLIQUID_TESTNET_PUBLIC_BASE_URL")
 WALLET_ADDRESS = os.getenv("TESTNET_WALLET_ADDRESS")
+CANCEL_BATCH_SIZE = 50  # 每个签名请求最多取消的订单数，避免请求体过大
 
 
 async def method_cancel_single_order(private_key: str) -> None:
@@ -25,10 +33,12 @@ async def method_cancel_single_order(private_key: str) -> None:
 
     try:
         account = Account.from_key(private_key)
-        exchange = Exchange(account, BASE_URL)
-        info = Info(BASE_URL, skip_ws=True)
+        exchange, info = await asyncio.gather(
+            asyncio.to_thread(Exchange, account, BASE_URL),
+            asyncio.to_thread(Info, BASE_URL, skip_ws=True),
+        )
 
-        open_orders = info.open_orders(WALLET_ADDRESS)
+        open_orders = await asyncio.to_thread(info.open_orders, WALLET_ADDRESS)
 
         if not open_orders:
             print("No open orders to cancel")
@@ -52,13 +62,13 @@ async def method_cancel_single_order(private_key: str) -> None:
             print(f"\nCancelling order {order_id}...")
             print(f"Order details: coin={first_order.get('coin')}, oid={order_id}")
 
-            result = exchange.cancel(
-                name=first_order.get("coin", ""), oid=int(order_id)
+            result = await asyncio.to_thread(
+                exchange.cancel, name=first_order.get("coin", ""), oid=int(order_id)
             )
 
             print(f"Cancel result type: {type(result)}")
             print(f"Cancel result:")
-            print(json.dumps(result, indent=2))
+            print(to_pretty_json(result))
 
             # 检查结果结构
             if result and isinstance(result, dict):
@@ -71,10 +81,10 @@ async def method_cancel_single_order(private_key: str) -> None:
 
                         # 验证取消
                         await asyncio.sleep(2)
-                        new_orders = info.open_orders(account.address)
+                        new_orders = await asyncio.to_thread(info.open_orders, account.address)
 
-                        still_exists = any(o.get("oid") == order_id for o in new_orders)
-                        if not still_exists:
+                        open_oids = {o.get("oid") for o in new_orders}
+                        if order_id not in open_oids:
                             print(f"✅ Cancellation confirmed - order removed")
                         else:
                             print(f"⚠️  Order still appears (may take time to update)")
@@ -89,6 +99,49 @@ async def method_cancel_single_order(private_key: str) -> None:
         print(f"❌ SDK method failed: {e}")
 
 
+async def method_bulk_cancel(private_key: str, coin: Optional[str] = None) -> None:
+    """方法：使用bulk_cancel批量取消订单（coin为None时取消全部），每批一次签名请求"""
+    print(f"Method: Bulk Cancel ({coin or 'all assets'})")
+    print("-" * 30)
+
+    try:
+        account = Account.from_key(private_key)
+        exchange, info = await asyncio.gather(
+            asyncio.to_thread(Exchange, account, BASE_URL),
+            asyncio.to_thread(Info, BASE_URL, skip_ws=True),
+        )
+
+        open_orders = await asyncio.to_thread(info.open_orders, WALLET_ADDRESS)
+        cancel_requests = [
+            {"coin": o["coin"], "oid": int(o["oid"])}
+            for o in open_orders
+            if coin is None or o.get("coin") == coin
+        ]
+
+        if not cancel_requests:
+            print("No open orders to cancel")
+            return
+
+        print(f"Cancelling {len(cancel_requests)} orders...")
+
+        # 按批发送：N个订单只需 ceil(N / CANCEL_BATCH_SIZE) 次往返
+        cancelled = 0
+        for i in range(0, len(cancel_requests), CANCEL_BATCH_SIZE):
+            batch = cancel_requests[i:i + CANCEL_BATCH_SIZE]
+            result = await asyncio.to_thread(exchange.bulk_cancel, batch)
+
+            if result and result.get("status") == "ok":
+                statuses = result.get("response", {}).get("data", {}).get("statuses", [])
+                cancelled += sum(1 for status in statuses if status == "success")
+            else:
+                print(f"❌ Batch {i // CANCEL_BATCH_SIZE + 1} failed: {result}")
+
+        print(f"✅ Cancelled {cancelled}/{len(cancel_requests)} orders")
+
+    except Exception as e:
+        print(f"❌ Bulk cancel failed: {e}")
+
+
 async def main() -> None:
     print("Hyperliquid Order Cancellation")
     print("=" * 40)
@@ -100,8 +153,13 @@ async def main() -> None:
         print("WARNING: This will cancel REAL orders on testnet!")
         return
 
-    await method_cancel_single_order(private_key)
+    # 传入币种（如 BTC）或 all 时批量取消，否则演示取消单个订单
+    if len(sys.argv) > 1:
+        target = sys.argv[1]
+        await method_bulk_cancel(private_key, None if target.lower() == "all" else target)
+    else:
+        await method_cancel_single_order(private_key)
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    run(main())
@@ -4,8 +4,9 @@
 """
 
 import asyncio
-import json
 import os
+import sys
+from pathlib import Path
 from typing import Optional
 
 from dotenv import load_dotenv
@@ -14,6 +15,11 @@ from hyperliquid.exchange import Exchange
 from hyperliquid.info import Info
 from hyperliquid.utils.signing import OrderType as HLOrderType
 
+# 将learning_examples添加到路径以便导入共享模块
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from _runtime import run, to_pretty_json
+
 load_dotenv()
 
 # 你只能在官方Hyperliquid公共API上使用此端点。
@@ -31,10 +37,12 @@ async def method_sdk(private_key: str) -> Optional[str]:
 
     try:
         wallet = Account.from_key(private_key)
-        exchange = Exchange(wallet, BASE_URL)
-        info = Info(BASE_URL, skip_ws=True)
+        exchange, info = await asyncio.gather(
+            asyncio.to_thread(Exchange, wallet, BASE_URL),
+            asyncio.to_thread(Info, BASE_URL, skip_ws=True),
+        )
 
-        all_prices = info.all_mids()
+        all_prices = await asyncio.to_thread(info.all_mids)
         market_price = float(all_prices.get(SYMBOL, 0))
 
         if market_price == 0:
@@ -47,7 +55,8 @@ async def method_sdk(private_key: str) -> Optional[str]:
         print(f"Current {SYMBOL} price: ${market_price:,.2f}")
         print(f"Placing buy order: {ORDER_SIZE} {SYMBOL} @ ${order_price:,.2f}")
 
-        result = exchange.order(
+        result = await asyncio.to_thread(
+            exchange.order,
             name=SYMBOL,
             is_buy=True,
             sz=ORDER_SIZE,
@@ -57,7 +66,7 @@ async def method_sdk(private_key: str) -> Optional[str]:
         )
 
         print(f"Order result:")
-        print(json.dumps(result, indent=2))
+        print(to_pretty_json(result))
 
         if result and result.get("status") == "ok":
             response_data = result.get("response", {}).get("data", {})
@@ -100,4 +109,4 @@ async def main() -> None:
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    run(main())
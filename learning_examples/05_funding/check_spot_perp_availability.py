@@ -7,12 +7,27 @@
 """
 
 import asyncio
+import functools
 import os
-from typing import Dict, List, Set, Optional
+import sys
+from pathlib import Path
+from typing import Dict, Iterable, List, Set, Optional
+
+try:
+    import orjson
+except ImportError:
+    import json as orjson
+
 from dotenv import load_dotenv
 import httpx
 from hyperliquid.info import Info
 
+# 将learning_examples添加到路径以便导入共享模块
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from _cache import cache_key, load_cached, save_cached
+from hl_info_core import close_client, format_asset_grid, get_client, post_info, run
+
 load_dotenv()
 
 CHAINSTACK_BASE_URL = os.getenv("HYPERLIQUID_CHAINSTACK_BASE_URL")
@@ -21,39 +36,45 @@ PUBLIC_BASE_URL = os.getenv("HYPERLIQUID_PUBLIC_BASE_URL")
 TEST_ASSETS = ["BTC", "ETH", "SOL"]
 
 
+@functools.lru_cache(maxsize=4)
+def get_info(base_url: str) -> Info:
+    """按base_url缓存Info实例（构造时会请求元数据），复用其requests会话"""
+    return Info(base_url, skip_ws=True)
+
+
+async def warm_up_client(base_url: str) -> None:
+    """向base_url发一个轻量请求，提前完成TCP+TLS握手，之后的请求复用该连接；失败忽略"""
+    try:
+        await get_client().post(f"{base_url}/info", content=b'{"type":"allMids"}')
+    except httpx.HTTPError:
+        pass
+
+
+def write_asset_grid(header: str, assets: Iterable[str], per_row: int, width: int) -> None:
+    """把资产网格连同标题一次性写入stdout"""
+    sys.stdout.write("\n".join([header, *format_asset_grid(assets, per_row, width)]) + "\n")
+
+
 async def get_spot_assets() -> Optional[Set[str]]:
     """获取所有可用于现货交易的资产"""
     print("Spot Assets")
     print("-" * 30)
 
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{CHAINSTACK_BASE_URL}/info",
-                json={"type": "spotMeta"},
-                headers={"Content-Type": "application/json"},
-            )
-
-            if response.status_code == 200:
-                spot_meta = response.json()
-                spot_assets = set()
-                
-                if "tokens" in spot_meta:
-                    for token_info in spot_meta["tokens"]:
-                        asset_name = token_info.get("name", "")
-                        if asset_name:
-                            spot_assets.add(asset_name)
-                
-                print(f"Found {len(spot_assets)} spot assets")
-                sorted_assets = sorted(list(spot_assets))
-                for i in range(0, len(sorted_assets), 6):
-                    row = sorted_assets[i:i+6]
-                    print(f"   {', '.join(f'{asset:>6}' for asset in row)}")
-                
-                return spot_assets
-            else:
-                print(f"HTTP failed: {response.status_code}")
-                return None
+        key = cache_key(CHAINSTACK_BASE_URL, "spotMeta")
+        spot_meta = load_cached(key)
+        if spot_meta is None:
+            spot_meta = await post_info(CHAINSTACK_BASE_URL, {"type": "spotMeta"})
+            save_cached(key, spot_meta)
+
+        spot_assets = {
+            name for token_info in spot_meta.get("tokens", [])
+            if (name := token_info.get("name"))
+        }
+
+        write_asset_grid(f"Found {len(spot_assets)} spot assets", spot_assets, 6, 6)
+
+        return spot_assets
 
     except Exception as e:
         print(f"Spot assets failed: {e}")
@@ -66,21 +87,19 @@ async def get_perp_assets() -> Optional[Set[str]]:
     print("-" * 35)
 
     try:
-        info = Info(CHAINSTACK_BASE_URL, skip_ws=True)
-        meta = info.meta()
-        perp_assets = set()
-        
-        if "universe" in meta:
-            for asset_info in meta["universe"]:
-                asset_name = asset_info.get("name", "")
-                if asset_name:
-                    perp_assets.add(asset_name)
-        
-        print(f"Found {len(perp_assets)} perpetual assets")
-        sorted_assets = sorted(list(perp_assets))
-        for i in range(0, len(sorted_assets), 6):
-            row = sorted_assets[i:i+6]
-            print(f"   {', '.join(f'{asset:>6}' for asset in row)}")
+        key = cache_key(CHAINSTACK_BASE_URL, "meta")
+        meta = load_cached(key)
+        if meta is None:
+            info = await asyncio.to_thread(get_info, CHAINSTACK_BASE_URL)
+            meta = await asyncio.to_thread(info.meta)
+            save_cached(key, meta)
+
+        perp_assets = {
+            name for asset_info in meta.get("universe", [])
+            if (name := asset_info.get("name"))
+        }
+
+        write_asset_grid(f"Found {len(perp_assets)} perpetual assets", perp_assets, 6, 6)
         
         return perp_assets
 
@@ -107,16 +126,15 @@ async def find_arbitrage_eligible_assets() -> Optional[List[Dict]]:
         print("No assets found in both spot and perpetual markets")
         return None
     
-    print(f"\nFound {len(eligible_assets)} assets available in BOTH markets:")
-    sorted_eligible = sorted(list(eligible_assets))
-    for i in range(0, len(sorted_eligible), 8):
-        row = sorted_eligible[i:i+8]
-        print(f"   {', '.join(f'{asset:>5}' for asset in row)}")
+    write_asset_grid(
+        f"\nFound {len(eligible_assets)} assets available in BOTH markets:",
+        eligible_assets, 8, 5,
+    )
 
     # 获取符合条件资产的当前资金费率
     try:
-        info = Info(PUBLIC_BASE_URL, skip_ws=True)
-        meta_and_contexts = info.meta_and_asset_ctxs()
+        info = await asyncio.to_thread(get_info, PUBLIC_BASE_URL)
+        meta_and_contexts = await asyncio.to_thread(info.meta_and_asset_ctxs)
         
         eligible_with_funding = []
         
@@ -124,33 +142,37 @@ async def find_arbitrage_eligible_assets() -> Optional[List[Dict]]:
             meta = meta_and_contexts[0]
             asset_ctxs = meta_and_contexts[1]
 
-            # 通过索引将universe中的资产名称映射到contexts
-            for i, asset_ctx in enumerate(asset_ctxs):
-                asset_name = meta["universe"][i]["name"] if i < len(meta["universe"]) else f"UNKNOWN_{i}"
-                if asset_name in eligible_assets:
-                    funding_rate = float(asset_ctx.get("funding", "0"))
-                    mark_price = float(asset_ctx.get("markPx", "0"))
-                    
-                    eligible_with_funding.append({
-                        "asset": asset_name,
-                        "funding_rate": funding_rate,
-                        "funding_rate_pct": funding_rate * 100,
-                        "mark_price": mark_price,
-                        "eligible_for_arbitrage": funding_rate > 0.0001  # 正资金费率阈值
-                    })
-            
-            eligible_with_funding.sort(key=lambda x: x["funding_rate"], reverse=True)
-            
-            print("\nFunding Rates for Eligible Assets:")
-            print("-" * 45)
-            print(f"{'Asset':>6} {'Funding %':>10} {'Price':>12} {'Arbitrage':>10}")
-            print("-" * 45)
-            
-            for asset_data in eligible_with_funding:
-                arbitrage_status = "✓ YES" if asset_data["eligible_for_arbitrage"] else "✗ No"
-                print(f"{asset_data['asset']:>6} {asset_data['funding_rate_pct']:>9.4f}% "
-                      f"${asset_data['mark_price']:>10,.2f} {arbitrage_status:>10}")
-            
+            # universe名称只取一次，按索引与contexts对齐；单次遍历只保留两个市场都有的资产
+            names = [asset_info["name"] for asset_info in meta["universe"]]
+            rows = [
+                (float(asset_ctx.get("funding", "0")), name,
+                 float(asset_ctx.get("markPx", "0")))
+                for name, asset_ctx in zip(names, asset_ctxs)
+                if name in eligible_assets
+            ]
+            rows.sort(reverse=True)  # 元组比较：按资金费率降序
+
+            lines = [
+                "\nFunding Rates for Eligible Assets:",
+                "-" * 45,
+                f"{'Asset':>6} {'Funding %':>10} {'Price':>12} {'Arbitrage':>10}",
+                "-" * 45,
+            ]
+            for funding_rate, asset_name, mark_price in rows:
+                eligible = funding_rate > 0.0001  # 正资金费率阈值
+                eligible_with_funding.append({
+                    "asset": asset_name,
+                    "funding_rate": funding_rate,
+                    "funding_rate_pct": funding_rate * 100,
+                    "mark_price": mark_price,
+                    "eligible_for_arbitrage": eligible,
+                })
+                arbitrage_status = "✓ YES" if eligible else "✗ No"
+                lines.append(f"{asset_name:>6} {funding_rate * 100:>9.4f}% "
+                             f"${mark_price:>10,.2f} {arbitrage_status:>10}")
+            lines.append("")
+            sys.stdout.write("\n".join(lines))
+
             return eligible_with_funding
     
     except Exception as e:
@@ -158,63 +180,87 @@ async def find_arbitrage_eligible_assets() -> Optional[List[Dict]]:
         return []
 
 
+async def _fetch_book(client: httpx.AsyncClient, asset: str) -> Optional[Dict]:
+    """获取单个资产的L2订单簿，计算价差和前5档深度"""
+    # 你只能在官方Hyperliquid公共API上使用此端点
+    response = await client.post(
+        f"{PUBLIC_BASE_URL}/info", content=orjson.dumps({"type": "l2Book", "coin": asset})
+    )
+    response.raise_for_status()
+
+    levels = orjson.loads(response.content).get("levels", [])
+    if len(levels) < 2:
+        return None
+
+    bids = levels[0]  # 买单
+    asks = levels[1]  # 卖单
+    if not bids or not asks:
+        return None
+
+    best_bid_price = float(bids[0]["px"])
+    best_ask_price = float(asks[0]["px"])
+    spread = best_ask_price - best_bid_price
+
+    return {
+        "asset": asset,
+        "spread_pct": (spread / best_bid_price) * 100 if best_bid_price > 0 else 0,
+        "bid_size": sum(float(level["sz"]) for level in bids[:5]),  # 前5个层级
+        "ask_size": sum(float(level["sz"]) for level in asks[:5]),
+    }
+
+
 async def get_market_liquidity_info() -> None:
     """获取顶级套利候选资产的基本流动性信息"""
     print("\nMarket Liquidity Analysis")
     print("-" * 30)
 
     try:
-        async with httpx.AsyncClient() as client:
-            for asset in TEST_ASSETS:
-                # 你只能在官方Hyperliquid公共API上使用此端点
-                response = await client.post(
-                    f"{PUBLIC_BASE_URL}/info",
-                    json={"type": "l2Book", "coin": asset},
-                    headers={"Content-Type": "application/json"},
-                )
-                
-                if response.status_code == 200:
-                    book_data = response.json()
-                    levels = book_data.get("levels", [])
-
-                    if len(levels) >= 2:
-                        bids = levels[0]  # 买单
-                        asks = levels[1]  # 卖单
-                        
-                        if bids and asks:
-                            best_bid_price = float(bids[0]["px"]) if bids else 0
-                            best_ask_price = float(asks[0]["px"]) if asks else 0
-                            spread = best_ask_price - best_bid_price
-                            spread_pct = (spread / best_bid_price) * 100 if best_bid_price > 0 else 0
-
-                            bid_size = sum(float(level["sz"]) for level in bids[:5])  # 前5个层级
-                            ask_size = sum(float(level["sz"]) for level in asks[:5])
-                            
-                            print(f"   {asset}: Spread {spread_pct:.3f}%, "
-                                  f"Bid depth: {bid_size:.2f}, Ask depth: {ask_size:.2f}")
+        client = get_client()
+        # 所有资产的订单簿请求同时发出
+        # 单个资产请求失败只跳过该资产，不影响其他资产
+        books = await asyncio.gather(
+            *(_fetch_book(client, asset) for asset in TEST_ASSETS), return_exceptions=True
+        )
+
+        lines = [
+            f"   {book['asset']}: Spread {book['spread_pct']:.3f}%, "
+            f"Bid depth: {book['bid_size']:.2f}, Ask depth: {book['ask_size']:.2f}"
+            for book in books if isinstance(book, dict)
+        ]
+        if lines:
+            lines.append("")
+            sys.stdout.write("\n".join(lines))
 
     except Exception as e:
         print(f"Liquidity analysis failed: {e}")
 
 
 async def main():
-    print("Hyperliquid Spot vs Perpetual Market Analysis")
-    print("=" * 55)
+    try:
+        print("Hyperliquid Spot vs Perpetual Market Analysis")
+        print("=" * 55)
+
+        # 订单簿请求发往公共API，与前面的查询不是同一主机；
+        # 在资产查询期间后台预热该连接，并发的订单簿请求就不必各自握手
+        warm_up = asyncio.create_task(warm_up_client(PUBLIC_BASE_URL))
 
-    eligible_assets = await find_arbitrage_eligible_assets()
-    await get_market_liquidity_info()
+        eligible_assets = await find_arbitrage_eligible_assets()
+        await warm_up
+        await get_market_liquidity_info()
     
-    if eligible_assets:
-        positive_funding_assets = [a for a in eligible_assets if a["eligible_for_arbitrage"]]
-        print("\nSummary:")
-        print(f"   Total eligible assets: {len(eligible_assets)}")
-        print(f"   Assets with positive funding: {len(positive_funding_assets)}")
+        if eligible_assets:
+            positive_funding_assets = [a for a in eligible_assets if a["eligible_for_arbitrage"]]
+            print("\nSummary:")
+            print(f"   Total eligible assets: {len(eligible_assets)}")
+            print(f"   Assets with positive funding: {len(positive_funding_assets)}")
         
-        if positive_funding_assets:
-            best_opportunity = positive_funding_assets[0]
-            print(f"   Best opportunity: {best_opportunity['asset']} "
-                  f"({best_opportunity['funding_rate_pct']:+.4f}%)")
+            if positive_funding_assets:
+                best_opportunity = positive_funding_assets[0]
+                print(f"   Best opportunity: {best_opportunity['asset']} "
+                      f"({best_opportunity['funding_rate_pct']:+.4f}%)")
+    finally:
+        await close_client()
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    run(main())
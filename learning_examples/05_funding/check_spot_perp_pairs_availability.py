@@ -11,155 +11,127 @@
 
 import asyncio
 import os
-from typing import Dict, List, Set, Optional
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+try:
+    import orjson
+except ImportError:
+    import json as orjson
+
 from dotenv import load_dotenv
 import httpx
-from hyperliquid.info import Info
+
+from hl_info_core import close_client, format_asset_grid, get_client, get_meta_and_asset_ctxs, post_info, run, send_with_retry, universe
 
 load_dotenv()
 
-CHAINSTACK_BASE_URL = os.getenv("HYPERLIQUID_CHAINSTACK_BASE_URL")
 PUBLIC_BASE_URL = os.getenv("HYPERLIQUID_PUBLIC_BASE_URL")
 
 TEST_ASSETS = ["BTC", "ETH", "SOL"]
 MIN_FUNDING_RATE = 0.0001
 
 
-async def get_spot_markets() -> Optional[Dict[str, Dict]]:
+def _iter_spot_markets(spot_meta: Dict) -> Iterator[Tuple[str, str]]:
+    """遍历现货universe，产出 (基础代币, 市场标识符)"""
+    # 构建代币索引 -> 代币符号
+    token_by_index = {}
+    for t in spot_meta.get("tokens", []):
+        idx = t.get("index")
+        name = t.get("name")
+        if isinstance(idx, int) and isinstance(name, str) and name:
+            token_by_index[idx] = name
+
+    for i, mkt in enumerate(spot_meta.get("universe", [])):
+        token_idxs = mkt.get("tokens", [])
+        if not (isinstance(token_idxs, list) and len(token_idxs) >= 2):
+            continue
+
+        base = token_by_index.get(token_idxs[0])
+
+        # 现货市场标识符：规范的为"PURR/USDC"，其他大多为"@1"
+        market_id = mkt.get("name") or f"@{mkt.get('index', i)}"
+
+        if not base or not market_id:
+            continue
+
+        yield base, market_id
+
+
+async def get_spot_market_ids() -> Optional[Dict[str, List[str]]]:
     """
-    使用spotMetaAndAssetCtxs获取所有现货市场（交易对ID）和现货contexts。
+    使用spotMetaAndAssetCtxs获取所有现货市场（交易对ID），只保留标识符。
 
-    返回按基础代币符号键入的映射：
+    返回按基础代币符号键入、已排序的市场标识符列表：
       {
-        "PURR": {
-            "market_ids": {"PURR/USDC"},        # 规范名称或@index
-            "by_market_id": {
-                "PURR/USDC": {"ctx": {...}, "quote": "USDC", "market_index": 0},
-                ...
-            }
-        },
-        "HFUN": {
-            "market_ids": {"@1"},
-            "by_market_id": {"@1": {"ctx": {...}, "quote": "USDC", "market_index": 1}}
-        },
+        "PURR": ["PURR/USDC"],   # 规范名称或@index
+        "HFUN": ["@1"],
         ...
       }
     """
-    print("Spot Markets (Pairs/Ids) via spotMetaAndAssetCtxs")
-    print("-" * 55)
+    lines = ["Spot Markets (Pairs/Ids) via spotMetaAndAssetCtxs", "-" * 55]
 
     try:
-        async with httpx.AsyncClient() as client:
-            # 你只能在官方Hyperliquid公共API上使用此端点
-            resp = await client.post(
-                f"{PUBLIC_BASE_URL}/info",
-                json={"type": "spotMetaAndAssetCtxs"},
-                headers={"Content-Type": "application/json"},
-            )
-
-            if resp.status_code != 200:
-                print(f"HTTP failed: {resp.status_code}")
-                return None
-
-            data = resp.json()
-            if not (isinstance(data, list) and len(data) >= 2):
-                print("Unexpected response format for spotMetaAndAssetCtxs")
-                return None
-
-            spot_meta = data[0]
-            spot_ctxs = data[1]
-
-            tokens = spot_meta.get("tokens", [])
-            universe = spot_meta.get("universe", [])
-
-            if not tokens or not universe:
-                print("Missing tokens/universe in spotMetaAndAssetCtxs")
-                return None
-
-            # 构建代币索引 -> 代币符号
-            token_by_index = {}
-            for t in tokens:
-                idx = t.get("index")
-                name = t.get("name")
-                if isinstance(idx, int) and isinstance(name, str) and name:
-                    token_by_index[idx] = name
-
-            spot_markets: Dict[str, Dict] = {}
-
-            for i, mkt in enumerate(universe):
-                token_idxs = mkt.get("tokens", [])
-                if not (isinstance(token_idxs, list) and len(token_idxs) >= 2):
-                    continue
-
-                base_idx, quote_idx = token_idxs[0], token_idxs[1]
-                base = token_by_index.get(base_idx)
-                quote = token_by_index.get(quote_idx)
-
-                # 现货市场标识符：规范的为"PURR/USDC"，其他大多为"@1"
-                market_id = mkt.get("name") or f"@{mkt.get('index', i)}"
-                market_index = mkt.get("index", i)
-
-                if not base or not market_id:
-                    continue
-
-                ctx = spot_ctxs[i] if i < len(spot_ctxs) and isinstance(spot_ctxs[i], dict) else {}
-
-                spot_markets.setdefault(base, {"market_ids": set(), "by_market_id": {}})
-                spot_markets[base]["market_ids"].add(market_id)
-                spot_markets[base]["by_market_id"][market_id] = {
-                    "ctx": ctx,
-                    "quote": quote,
-                    "market_index": market_index,
-                    "isCanonical": bool(mkt.get("isCanonical", False)),
-                }
-
-            # 打印简洁摘要
-            total_markets = sum(len(v["market_ids"]) for v in spot_markets.values())
-            print(f"Found {total_markets} spot markets across {len(spot_markets)} base tokens")
-            preview = []
-            for base, blob in sorted(spot_markets.items()):
-                for mid in sorted(blob["market_ids"]):
-                    preview.append(f"{base}:{mid}")
-            for row_i in range(0, min(len(preview), 36), 6):
-                print("   " + " | ".join(preview[row_i:row_i+6]))
-            if len(preview) > 36:
-                print(f"   ... +{len(preview)-36} more")
-
-            return spot_markets
+        # 你只能在官方Hyperliquid公共API上使用此端点
+        data = await post_info(PUBLIC_BASE_URL, {"type": "spotMetaAndAssetCtxs"})
+        if not (isinstance(data, list) and len(data) >= 2):
+            lines.append("Unexpected response format for spotMetaAndAssetCtxs")
+            return None
+
+        spot_meta = data[0]
+        if not spot_meta.get("tokens") or not spot_meta.get("universe"):
+            lines.append("Missing tokens/universe in spotMetaAndAssetCtxs")
+            return None
+
+        market_ids: Dict[str, Set[str]] = {}
+        for base, market_id in _iter_spot_markets(spot_meta):
+            market_ids.setdefault(base, set()).add(market_id)
+
+        # 每个基础代币的交易对只排序一次，后续展示和结果直接复用
+        spot_markets = {base: sorted(ids) for base, ids in market_ids.items()}
+
+        # 打印简洁摘要
+        total_markets = sum(len(pairs) for pairs in spot_markets.values())
+        lines.append(f"Found {total_markets} spot markets across {len(spot_markets)} base tokens")
+        preview = []
+        for base, pairs in sorted(spot_markets.items()):
+            for mid in pairs:
+                preview.append(f"{base}:{mid}")
+        for row_i in range(0, min(len(preview), 36), 6):
+            lines.append("   " + " | ".join(preview[row_i:row_i+6]))
+        if len(preview) > 36:
+            lines.append(f"   ... +{len(preview)-36} more")
+
+        return spot_markets
 
     except Exception as e:
-        print(f"Spot markets failed: {e}")
+        lines.append(f"Spot markets failed: {e}")
         return None
 
+    finally:
+        print("\n".join(lines))
+
 
 async def get_perp_assets() -> Optional[Set[str]]:
     """获取所有可用于永续合约交易的资产。"""
-    print("\nPerpetual Assets")
-    print("-" * 35)
+    lines = ["\nPerpetual Assets", "-" * 35]
 
     try:
-        info = Info(CHAINSTACK_BASE_URL, skip_ws=True)
-        meta = info.meta()
-        perp_assets = set()
-
-        if "universe" in meta:
-            for asset_info in meta["universe"]:
-                asset_name = asset_info.get("name", "")
-                if asset_name:
-                    perp_assets.add(asset_name)
-
-        print(f"Found {len(perp_assets)} perpetual assets")
-        sorted_assets = sorted(list(perp_assets))
-        for i in range(0, len(sorted_assets), 6):
-            row = sorted_assets[i:i+6]
-            print(f"   {', '.join(f'{asset:>6}' for asset in row)}")
+        # universe取自metaAndAssetCtxs，之后的资金费率查询命中缓存，不再单独请求meta
+        meta, _ = await get_meta_and_asset_ctxs(PUBLIC_BASE_URL)
+        perp_assets = {name for name in universe.update(meta).names if name}
+
+        lines.append(f"Found {len(perp_assets)} perpetual assets")
+        lines.extend(format_asset_grid(perp_assets, 6, 6))
 
         return perp_assets
 
     except Exception as e:
-        print(f"Perp assets failed: {e}")
+        lines.append(f"Perp assets failed: {e}")
         return None
 
+    finally:
+        print("\n".join(lines))
+
 
 async def find_arbitrage_eligible_assets() -> Optional[List[Dict]]:
     """
@@ -171,8 +143,9 @@ async def find_arbitrage_eligible_assets() -> Optional[List[Dict]]:
     print("\nFunding Arbitrage Eligible Assets (Spot pairs + Perps)")
     print("=" * 55)
 
-    spot_markets = await get_spot_markets()
-    perp_assets = await get_perp_assets()
+    # 现货和永续合约查询相互独立，并发执行
+    # 这里只需要交易对标识符，不构建现货contexts
+    spot_markets, perp_assets = await asyncio.gather(get_spot_market_ids(), get_perp_assets())
 
     if not spot_markets or not perp_assets:
         print("Failed to get market data")
@@ -186,116 +159,141 @@ async def find_arbitrage_eligible_assets() -> Optional[List[Dict]]:
         return None
 
     print(f"\nFound {len(eligible_assets)} base assets available in BOTH markets.")
-    for base in sorted(list(eligible_assets)):
-        pairs = sorted(list(spot_markets[base]["market_ids"]))
+    for base in sorted(eligible_assets):
+        pairs = spot_markets[base]
         pairs_preview = ", ".join(pairs[:6]) + (f" ...(+{len(pairs)-6})" if len(pairs) > 6 else "")
         print(f"   {base:>6}: {pairs_preview}")
 
     # 为符合条件的资产附加当前永续合约资金费率
     try:
-        info = Info(PUBLIC_BASE_URL, skip_ws=True)
-        meta_and_contexts = info.meta_and_asset_ctxs()
+        meta, asset_ctxs = await get_meta_and_asset_ctxs(PUBLIC_BASE_URL)
 
         eligible_with_funding = []
 
-        if meta_and_contexts and len(meta_and_contexts) >= 2:
-            meta = meta_and_contexts[0]
-            asset_ctxs = meta_and_contexts[1]
+        if asset_ctxs:
+            # universe名称与contexts按下标对齐，用集合交集挑出符合条件的资产后直接按下标取context
+            name_to_idx = universe.update(meta).name_to_idx
+
+            # 一次遍历只收集 (费率, 名称, 标记价格) 元组并排序，随后在同一个循环中构建结果和表格行
+            rows = []
+            for asset_name in eligible_assets & name_to_idx.keys():
+                idx = name_to_idx[asset_name]
+                if idx < len(asset_ctxs):
+                    asset_ctx = asset_ctxs[idx]
+                    rows.append((asset_ctx.funding, asset_name, asset_ctx.mark_px))
+            rows.sort(reverse=True)
+
+            lines = [
+                "\nFunding Rates for Eligible Assets:",
+                "-" * 90,
+                f"{'Asset':>6} {'Funding %':>10} {'Perp Mark':>12} {'Arb?':>8}  {'Spot pairs (preview)':<40}",
+                "-" * 90,
+            ]
+
+            for funding_rate, asset_name, mark_price in rows:
+                pairs = spot_markets[asset_name]
+                eligible = funding_rate > MIN_FUNDING_RATE
+                eligible_with_funding.append({
+                    "asset": asset_name,
+                    "spot_pairs": pairs,  # ✅ 交易对，而非代币
+                    "funding_rate": funding_rate,
+                    "funding_rate_pct": funding_rate * 100,
+                    "perp_mark_price": mark_price,
+                    "eligible_for_arbitrage": eligible
+                })
+
+                arb = "✓ YES" if eligible else "✗ No"
+                pairs_preview = ", ".join(pairs[:3]) + (f" ...(+{len(pairs)-3})" if len(pairs) > 3 else "")
+                lines.append(f"{asset_name:>6} {funding_rate * 100:>9.4f}% "
+                             f"${mark_price:>10,.2f} {arb:>8}  {pairs_preview:<40}")
+
+            print("\n".join(lines))
+
+            return eligible_with_funding
+
+        return []
 
-            for i, asset_ctx in enumerate(asset_ctxs):
-                asset_name = meta["universe"][i]["name"] if i < len(meta["universe"]) else f"UNKNOWN_{i}"
+    except Exception as e:
+        print(f"Funding rate lookup failed: {e}")
+        return []
 
-                if asset_name in eligible_assets:
-                    funding_rate = float(asset_ctx.get("funding", "0"))
-                    mark_price = float(asset_ctx.get("markPx", "0"))
 
-                    pairs = sorted(list(spot_markets[asset_name]["market_ids"]))
-                    eligible_with_funding.append({
-                        "asset": asset_name,
-                        "spot_pairs": pairs,  # ✅ 交易对，而非代币
-                        "funding_rate": funding_rate,
-                        "funding_rate_pct": funding_rate * 100,
-                        "perp_mark_price": mark_price,
-                        "eligible_for_arbitrage": funding_rate > MIN_FUNDING_RATE
-                    })
+_FMT_BOOK = (
+    "   {asset}: Spread {spread_pct:.3f}%, Bid depth: {bid_size:.2f}, Ask depth: {ask_size:.2f}"
+).format
 
-            eligible_with_funding.sort(key=lambda x: x["funding_rate"], reverse=True)
 
-            print("\nFunding Rates for Eligible Assets:")
-            print("-" * 90)
-            print(f"{'Asset':>6} {'Funding %':>10} {'Perp Mark':>12} {'Arb?':>8}  {'Spot pairs (preview)':<40}")
-            print("-" * 90)
+async def _fetch_book(client: httpx.AsyncClient, asset: str) -> Optional[Dict]:
+    """获取单个资产的L2订单簿，计算价差和前5档深度；重试后仍失败时抛出异常"""
+    payload = orjson.dumps({"type": "l2Book", "coin": asset})
+    response = await send_with_retry(
+        lambda: client.post(f"{PUBLIC_BASE_URL}/info", content=payload)
+    )
 
-            for a in eligible_with_funding:
-                arb = "✓ YES" if a["eligible_for_arbitrage"] else "✗ No"
-                pairs_preview = ", ".join(a["spot_pairs"][:3]) + (f" ...(+{len(a['spot_pairs'])-3})" if len(a["spot_pairs"]) > 3 else "")
-                print(f"{a['asset']:>6} {a['funding_rate_pct']:>9.4f}% "
-                      f"${a['perp_mark_price']:>10,.2f} {arb:>8}  {pairs_preview:<40}")
+    levels = orjson.loads(response.content).get("levels", [])
+    if len(levels) < 2:
+        return None
 
-            return eligible_with_funding
+    bids = levels[0]
+    asks = levels[1]
+    if not bids or not asks:
+        return None
 
-        return []
+    best_bid_price = float(bids[0]["px"])
+    best_ask_price = float(asks[0]["px"])
+    spread = best_ask_price - best_bid_price
 
-    except Exception as e:
-        print(f"Funding rate lookup failed: {e}")
-        return []
+    return {
+        "asset": asset,
+        "spread_pct": (spread / best_bid_price) * 100 if best_bid_price > 0 else 0,
+        "bid_size": sum(float(level["sz"]) for level in bids[:5]),
+        "ask_size": sum(float(level["sz"]) for level in asks[:5]),
+    }
 
 
 async def get_market_liquidity_info() -> None:
     """获取几个高流动性资产的基本永续合约流动性信息。"""
-    print("\nPerp Market Liquidity Analysis")
-    print("-" * 35)
+    lines = ["\nPerp Market Liquidity Analysis", "-" * 35]
 
     try:
-        async with httpx.AsyncClient() as client:
-            for asset in TEST_ASSETS:
-                response = await client.post(
-                    f"{PUBLIC_BASE_URL}/info",
-                    json={"type": "l2Book", "coin": asset},
-                    headers={"Content-Type": "application/json"},
-                )
-
-                if response.status_code == 200:
-                    book_data = response.json()
-                    levels = book_data.get("levels", [])
-
-                    if len(levels) >= 2:
-                        bids = levels[0]
-                        asks = levels[1]
-
-                        if bids and asks:
-                            best_bid_price = float(bids[0]["px"])
-                            best_ask_price = float(asks[0]["px"])
-                            spread = best_ask_price - best_bid_price
-                            spread_pct = (spread / best_bid_price) * 100 if best_bid_price > 0 else 0
-
-                            bid_size = sum(float(level["sz"]) for level in bids[:5])
-                            ask_size = sum(float(level["sz"]) for level in asks[:5])
-
-                            print(f"   {asset}: Spread {spread_pct:.3f}%, "
-                                  f"Bid depth: {bid_size:.2f}, Ask depth: {ask_size:.2f}")
+        client = get_client()
+        # 所有资产的订单簿请求同时发出，总耗时约为最慢的一次往返
+        books = await asyncio.gather(
+            *(_fetch_book(client, asset) for asset in TEST_ASSETS), return_exceptions=True
+        )
+
+        # 单个资产失败不影响其他资产；所有行拼好后在finally中一次性输出
+        lines.extend(_FMT_BOOK(**book) for book in books if isinstance(book, dict))
 
     except Exception as e:
-        print(f"Liquidity analysis failed: {e}")
+        lines.append(f"Liquidity analysis failed: {e}")
+
+    finally:
+        print("\n".join(lines))
 
 
 async def main():
-    print("Hyperliquid Spot (Pairs) vs Perpetual Market Analysis")
-    print("=" * 65)
+    try:
+        print("Hyperliquid Spot (Pairs) vs Perpetual Market Analysis")
+        print("=" * 65)
 
-    eligible_assets = await find_arbitrage_eligible_assets()
-    await get_market_liquidity_info()
+        # 流动性分析与套利资产查询相互独立，并发执行；两者都在内部处理异常
+        eligible_assets, _ = await asyncio.gather(
+            find_arbitrage_eligible_assets(), get_market_liquidity_info()
+        )
 
-    if eligible_assets:
-        positive_funding_assets = [a for a in eligible_assets if a["eligible_for_arbitrage"]]
-        print("\nSummary:")
-        print(f"   Total eligible base assets: {len(eligible_assets)}")
-        print(f"   Assets with positive funding > {MIN_FUNDING_RATE*100:.4f}%: {len(positive_funding_assets)}")
+        if eligible_assets:
+            positive_funding_assets = [a for a in eligible_assets if a["eligible_for_arbitrage"]]
+            print("\nSummary:")
+            print(f"   Total eligible base assets: {len(eligible_assets)}")
+            print(f"   Assets with positive funding > {MIN_FUNDING_RATE*100:.4f}%: {len(positive_funding_assets)}")
 
-        if positive_funding_assets:
-            best = positive_funding_assets[0]
-            print(f"   Best (by funding): {best['asset']} ({best['funding_rate_pct']:+.4f}%)")
+            if positive_funding_assets:
+                best = positive_funding_assets[0]
+                print(f"   Best (by funding): {best['asset']} ({best['funding_rate_pct']:+.4f}%)")
+    finally:
+        await close_client()
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    run(main())
@@ -0,0 +1,148 @@
+"""
+长期运行的资金费率监控：通过WebSocket订阅代替每次运行都重新轮询REST。
+activeAssetCtx推送资金费率和标记价格，l2Book推送订单簿；
+分析代码可以按任意频率读取内存中的最新数据，不再产生请求。
+
+用法：uv run learning_examples/05_funding/funding_monitor.py [BTC ETH ...]
+"""
+
+import asyncio
+import os
+import sys
+import time
+from typing import Any, Dict, List, Optional
+
+from dotenv import load_dotenv
+from hyperliquid.info import Info
+
+from hl_info_core import run
+
+load_dotenv()
+
+BASE_URL = os.getenv("HYPERLIQUID_PUBLIC_BASE_URL")
+WATCH_ASSETS = ["BTC", "ETH", "SOL"]
+MIN_FUNDING_RATE = 0.0001  # 0.01%最小阈值
+REPORT_INTERVAL = 10.0     # 每10秒从内存打印一次报告
+MAX_AGE = 60.0             # 超过60秒没有推送的资产标记为过期
+
+
+class FundingMonitor:
+    """由activeAssetCtx和l2Book订阅持续填充的 资产 -> 资金费率/订单簿 缓存"""
+
+    def __init__(self, base_url: str, assets: List[str]) -> None:
+        self.base_url = base_url
+        self.assets = assets
+        self.info: Optional[Info] = None
+        self._ctxs: Dict[str, Dict[str, float]] = {}
+        self._books: Dict[str, Dict[str, float]] = {}
+
+    # ---- SDK WebSocket线程中的回调：每次整体替换该资产的条目，读取方无需加锁 ----
+
+    def _on_asset_ctx(self, msg: Any) -> None:
+        try:
+            data = msg["data"]
+            ctx = data["ctx"]
+            self._ctxs[data["coin"]] = {
+                "funding": float(ctx["funding"]),
+                "mark_px": float(ctx["markPx"]),
+                "updated_at": time.monotonic(),
+            }
+        except (KeyError, TypeError, ValueError):
+            return
+
+    def _on_book(self, msg: Any) -> None:
+        try:
+            data = msg["data"]
+            bids, asks = data["levels"]
+            best_bid = float(bids[0]["px"])
+            best_ask = float(asks[0]["px"])
+            self._books[data["coin"]] = {
+                "spread_pct": (best_ask - best_bid) / best_bid * 100 if best_bid > 0 else 0.0,
+                "bid_size": sum(float(level["sz"]) for level in bids[:5]),
+                "ask_size": sum(float(level["sz"]) for level in asks[:5]),
+            }
+        except (KeyError, TypeError, ValueError, IndexError):
+            return
+
+    # ---- 生命周期 ----
+
+    async def start(self) -> None:
+        """建立WebSocket，为每个资产订阅activeAssetCtx和l2Book"""
+        self.info = await asyncio.to_thread(Info, self.base_url, skip_ws=False)
+        for coin in self.assets:
+            self.info.subscribe({"type": "activeAssetCtx", "coin": coin}, self._on_asset_ctx)
+            self.info.subscribe({"type": "l2Book", "coin": coin}, self._on_book)
+
+    def stop(self) -> None:
+        if self.info is not None:
+            self.info.disconnect_websocket()
+            self.info = None
+
+    # ---- 读取 ----
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        """按资金费率降序返回已收到推送的资产（只读内存，不发请求）"""
+        now = time.monotonic()
+        rows = []
+        for coin in self.assets:
+            ctx = self._ctxs.get(coin)
+            if ctx is None:
+                continue
+            rows.append({
+                "asset": coin,
+                "funding": ctx["funding"],
+                "mark_px": ctx["mark_px"],
+                "stale": now - ctx["updated_at"] > MAX_AGE,
+                "book": self._books.get(coin),
+            })
+        rows.sort(key=lambda r: r["funding"], reverse=True)
+        return rows
+
+
+def format_report(rows: List[Dict[str, Any]]) -> str:
+    timestamp = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime())
+    lines = [f"\n📊 Funding snapshot ({timestamp})", "-" * 80]
+
+    if not rows:
+        lines.append("   Waiting for first updates...")
+
+    for r in rows:
+        arb = "✓ YES" if r["funding"] > MIN_FUNDING_RATE else "✗ No"
+        line = f"   {r['asset']:>6}: {r['funding'] * 100:+.4f}% @ ${r['mark_px']:,.2f} {arb:>6}"
+        book = r["book"]
+        if book:
+            line += (f" | Spread {book['spread_pct']:.3f}%, "
+                     f"Bid depth: {book['bid_size']:.2f}, Ask depth: {book['ask_size']:.2f}")
+        if r["stale"]:
+            line += " ⚠️ stale"
+        lines.append(line)
+
+    return "\n".join(lines)
+
+
+async def main() -> None:
+    print("Hyperliquid Funding Monitor (WebSocket)")
+    print("=" * 50)
+
+    if not BASE_URL:
+        print("❌ Missing HYPERLIQUID_PUBLIC_BASE_URL in .env")
+        return
+
+    assets = [a.upper() for a in sys.argv[1:]] or WATCH_ASSETS
+    print(f"📡 Watching {', '.join(assets)} (Ctrl+C to stop)")
+
+    monitor = FundingMonitor(BASE_URL, assets)
+    try:
+        await monitor.start()
+        while True:
+            await asyncio.sleep(REPORT_INTERVAL)
+            print(format_report(monitor.snapshot()))
+    finally:
+        monitor.stop()
+
+
+if __name__ == "__main__":
+    try:
+        run(main())
+    except KeyboardInterrupt:
+        print("\n👋 Goodbye!")
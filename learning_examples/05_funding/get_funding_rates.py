@@ -3,225 +3,155 @@
 显示哪些资产有正资金费率（永续合约支付给现货持有者）。
 """
 
-import asyncio
 import os
-from typing import Dict, List, Optional
+from operator import attrgetter
+from typing import Dict, List, Optional, Sequence
+
 from dotenv import load_dotenv
-import httpx
-from hyperliquid.info import Info
+
+from hl_info_core import AssetCtx, close_client, get_meta_and_asset_ctxs, post_info, run
 
 load_dotenv()
 
 BASE_URL = os.getenv("HYPERLIQUID_PUBLIC_BASE_URL")
 MIN_FUNDING_RATE = 0.0001  # 0.01%最小阈值
-
-
-async def get_funding_rates_sdk() -> Optional[List[Dict]]:
-    """方法1：使用Hyperliquid Python SDK"""
-    print("Method 1: Hyperliquid SDK")
+HOURS_PER_YEAR = 365 * 24  # 每小时支付一次资金费
+# 估算现货-永续合约套利的交易费用：
+# - 买入现货：~0.040% taker费用
+# - 做空永续合约：~0.015% taker费用
+# - 卖出现货：~0.040% taker费用（退出）
+# - 平仓永续合约：~0.015% taker费用（退出）
+ROUND_TRIP_FEE_RATE = 0.0011  # 总计~0.11%
+POSITION_VALUE = 10_000
+PROFIT_HORIZONS = (1, 8, 24)  # 持有小时数
+
+
+def rank_funding_opportunities(asset_ctxs: List[AssetCtx]) -> List[Dict]:
+    """筛选资金费率高于阈值的资产并按费率降序排列"""
+    rows = [ctx for ctx in asset_ctxs if ctx.funding > MIN_FUNDING_RATE]
+    rows.sort(key=attrgetter("funding"), reverse=True)
+
+    return [
+        {
+            "asset": ctx.name,
+            "funding_rate": ctx.funding,
+            "funding_rate_pct": ctx.funding * 100,
+            "annual_rate_pct": ctx.funding * 100 * HOURS_PER_YEAR,
+            "mark_price": ctx.mark_px,
+        }
+        for ctx in rows
+    ]
+
+
+def format_top_opportunities(funding_opportunities: List[Dict]) -> str:
+    lines = [f"Found {len(funding_opportunities)} positive funding opportunities", ""]
+    for i, opp in enumerate(funding_opportunities[:10], 1):
+        lines.append(f"{i:2d}. {opp['asset']:>6}: {opp['funding_rate_pct']:+7.4f}% "
+                     f"(Annual: {opp['annual_rate_pct']:+7.1f}%) @ ${opp['mark_price']:,.2f}")
+    return "\n".join(lines)
+
+
+async def get_funding_rates() -> Optional[List[Dict]]:
+    """通过SDK获取metaAndAssetCtxs并排名资金费率"""
+    print("Current Funding Rates (SDK)")
     print("-" * 30)
 
     try:
-        info = Info(BASE_URL, skip_ws=True)
-        meta_and_contexts = info.meta_and_asset_ctxs()
-        
-        funding_opportunities = []
-        
-        if meta_and_contexts and len(meta_and_contexts) >= 2:
-            meta = meta_and_contexts[0]
-            asset_ctxs = meta_and_contexts[1]
-
-            # 通过索引将universe中的资产名称映射到contexts
-            for i, asset_ctx in enumerate(asset_ctxs):
-                asset_name = meta["universe"][i]["name"] if i < len(meta["universe"]) else f"UNKNOWN_{i}"
-                funding_rate = float(asset_ctx.get("funding", "0"))
-                mark_price = float(asset_ctx.get("markPx", "0"))
-                
-                if funding_rate > MIN_FUNDING_RATE:
-                    funding_opportunities.append({
-                        "asset": asset_name,
-                        "funding_rate": funding_rate,
-                        "funding_rate_pct": funding_rate * 100,
-                        "annual_rate_pct": funding_rate * 100 * 365 * 24,  # 每天24次支付
-                        "mark_price": mark_price
-                    })
-            
-            funding_opportunities.sort(key=lambda x: x["funding_rate"], reverse=True)
-            
-            print(f"Found {len(funding_opportunities)} positive funding opportunities")
-            print()
-            
-            for i, opp in enumerate(funding_opportunities[:10], 1):
-                print(f"{i:2d}. {opp['asset']:>6}: {opp['funding_rate_pct']:+7.4f}% "
-                      f"(Annual: {opp['annual_rate_pct']:+7.1f}%) @ ${opp['mark_price']:,.2f}")
-            
-            return funding_opportunities
-        
-        return None
+        _, asset_ctxs = await get_meta_and_asset_ctxs(BASE_URL)
+        funding_rates = rank_funding_opportunities(asset_ctxs)
+        print(format_top_opportunities(funding_rates))
+        return funding_rates
 
     except Exception as e:
         print(f"SDK method failed: {e}")
         return None
 
 
-async def get_funding_rates_raw() -> Optional[List[Dict]]:
-    """方法2：原始HTTP API调用"""
-    print("\nMethod 2: Raw HTTP API")
-    print("-" * 30)
-
-    try:
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{BASE_URL}/info",
-                json={"type": "metaAndAssetCtxs"},
-                headers={"Content-Type": "application/json"},
-            )
-
-            if response.status_code == 200:
-                data = response.json()
-                funding_opportunities = []
-                
-                if len(data) >= 2:
-                    meta = data[0]
-                    asset_ctxs = data[1]
-
-                    # 通过索引将universe中的资产名称映射到contexts
-                    for i, asset_ctx in enumerate(asset_ctxs):
-                        asset_name = meta["universe"][i]["name"] if i < len(meta["universe"]) else f"UNKNOWN_{i}"
-                        funding_rate = float(asset_ctx.get("funding", "0"))
-                        mark_price = float(asset_ctx.get("markPx", "0"))
-                        
-                        if funding_rate > MIN_FUNDING_RATE:
-                            funding_opportunities.append({
-                                "asset": asset_name,
-                                "funding_rate": funding_rate,
-                                "funding_rate_pct": funding_rate * 100,
-                                "annual_rate_pct": funding_rate * 100 * 365 * 24,
-                                "mark_price": mark_price
-                            })
-                    
-                    funding_opportunities.sort(key=lambda x: x["funding_rate"], reverse=True)
-                    
-                    print(f"Found {len(funding_opportunities)} positive funding opportunities")
-                    print()
-                    
-                    for i, opp in enumerate(funding_opportunities[:10], 1):
-                        print(f"{i:2d}. {opp['asset']:>6}: {opp['funding_rate_pct']:+7.4f}% "
-                              f"(Annual: {opp['annual_rate_pct']:+7.1f}%) @ ${opp['mark_price']:,.2f}")
-                    
-                    return funding_opportunities
-            else:
-                print(f"HTTP failed: {response.status_code}")
-                return None
-
-    except Exception as e:
-        print(f"HTTP method failed: {e}")
-        return None
-
-
 async def get_predicted_fundings() -> Optional[Dict]:
     """获取跨交易所的预测资金费率"""
     print("\nPredicted Funding Rates (Cross-Exchange)")
     print("-" * 45)
 
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{BASE_URL}/info",
-                json={"type": "predictedFundings"},
-                headers={"Content-Type": "application/json"},
-            )
+        predicted_fundings = await post_info(BASE_URL, {"type": "predictedFundings"})
 
-            if response.status_code == 200:
-                predicted_fundings = response.json()
-
-                # 处理基于列表的响应格式
-                if isinstance(predicted_fundings, list):
-                    hl_positive_fundings = []
-                    
-                    for item in predicted_fundings:
-                        if len(item) >= 2:
-                            asset_name = item[0]
-                            exchange_data = item[1]
-                            
-                            for exchange_info in exchange_data:
-                                if len(exchange_info) >= 2:
-                                    exchange_name = exchange_info[0]
-                                    exchange_details = exchange_info[1]
-                                    
-                                    if exchange_name == 'HlPerp' and exchange_details and 'fundingRate' in exchange_details:
-                                        funding_rate = float(exchange_details['fundingRate'])
-                                        if funding_rate > MIN_FUNDING_RATE:
-                                            hl_positive_fundings.append((asset_name, funding_rate))
-
-                    # 显示Hyperliquid正资金费率
-                    if hl_positive_fundings:
-                        hl_positive_fundings.sort(key=lambda x: x[1], reverse=True)
-                        print("Hyperliquid Perp - Top positive funding rates:")
-                        for asset, rate in hl_positive_fundings[:10]:
-                            print(f"   {asset:>8}: {rate*100:+7.4f}%")
-                    else:
-                        print("No positive funding opportunities found")
+        # 处理基于列表的响应格式
+        if isinstance(predicted_fundings, list):
+            hl_positive_fundings = []
                 
-                else:
-                    print(f"Unexpected API response format: {type(predicted_fundings)}")
-                
-                return predicted_fundings
+            for item in predicted_fundings:
+                if len(item) >= 2:
+                    asset_name = item[0]
+                    exchange_data = item[1]
+                        
+                    # 每个资产只需要HlPerp一项：找到后立即跳出，不再遍历其他交易所
+                    for exchange_info in exchange_data:
+                        if len(exchange_info) >= 2 and exchange_info[0] == 'HlPerp':
+                            exchange_details = exchange_info[1]
+                            if exchange_details and 'fundingRate' in exchange_details:
+                                funding_rate = float(exchange_details['fundingRate'])
+                                if funding_rate > MIN_FUNDING_RATE:
+                                    hl_positive_fundings.append((asset_name, funding_rate))
+                            break
+
+            # 显示Hyperliquid正资金费率
+            if hl_positive_fundings:
+                hl_positive_fundings.sort(key=lambda x: x[1], reverse=True)
+                print("Hyperliquid Perp - Top positive funding rates:")
+                for asset, rate in hl_positive_fundings[:10]:
+                    print(f"   {asset:>8}: {rate*100:+7.4f}%")
             else:
-                print(f"HTTP failed: {response.status_code}")
-                return None
+                print("No positive funding opportunities found")
+            
+        else:
+            print(f"Unexpected API response format: {type(predicted_fundings)}")
+            
+        return predicted_fundings
 
     except Exception as e:
         print(f"Predicted fundings failed: {e}")
         return None
 
 
-def calculate_profit_potential(funding_rate: float, position_value: float, hours_held: int = 1) -> Dict:
-    """
-    计算现货多头 + 永续合约空头资金费率套利的潜在利润
-
-    策略：买入现货资产，在永续合约上做空等量
-    - 收取正资金费率支付（费率>0时永续合约空头收取资金费）
-    - 市场中性（现货多头对冲永续合约空头的价格风险）
-    """
-    funding_payments = hours_held
-    gross_profit = funding_rate * position_value * funding_payments
-
-    # 估算现货-永续合约套利的交易费用：
-    # - 买入现货：~0.040% taker费用
-    # - 做空永续合约：~0.015% taker费用
-    # - 卖出现货：~0.040% taker费用（退出）
-    # - 平仓永续合约：~0.015% taker费用（退出）
-    estimated_fees = position_value * 0.0011  # 总计~0.11%
-    net_profit = gross_profit - estimated_fees
-    
-    return {
-        "funding_payments": funding_payments,
-        "gross_profit": gross_profit,
-        "estimated_fees": estimated_fees,
-        "net_profit": net_profit,
-        "net_profit_pct": (net_profit / position_value) * 100
-    }
+def calculate_net_profit_grid(
+    funding_rates: Sequence[float], position_value: float, hours: Sequence[int]
+) -> List[List[float]]:
+    """批量计算 资金费率 x 持有时长 的净利润矩阵（行对应费率，列对应时长）；费用只计算一次"""
+    estimated_fees = position_value * ROUND_TRIP_FEE_RATE
+    return [
+        [rate * position_value * h - estimated_fees for h in hours]
+        for rate in funding_rates
+    ]
 
 
 async def main():
-    print("Hyperliquid Funding Rate Discovery")
-    print("=" * 50)
+    try:
+        print("Hyperliquid Funding Rate Discovery")
+        print("=" * 50)
+
+        funding_rates = await get_funding_rates()
+        predicted = await get_predicted_fundings()
 
-    sdk_rates = await get_funding_rates_sdk()
-    raw_rates = await get_funding_rates_raw()
-    predicted = await get_predicted_fundings()
+        if funding_rates:
+            top = funding_rates[:3]
+            grid = calculate_net_profit_grid(
+                [opp["funding_rate"] for opp in top], POSITION_VALUE, PROFIT_HORIZONS
+            )
 
-    if sdk_rates:
-        print("\nSpot-Perp Funding Arbitrage Analysis ($10,000 position)")
-        print("-" * 60)
-        print("Strategy: Long spot + Short perp (market neutral)")
-        
-        for opp in sdk_rates[:3]:
-            profit_1h = calculate_profit_potential(opp["funding_rate"], 10000, 1)
-            print(f"\n{opp['asset']} (Funding: {opp['funding_rate_pct']:+.4f}%):")
-            print(f"   1h profit: ${profit_1h['net_profit']:+.2f} ({profit_1h['net_profit_pct']:+.3f}%)")
+            lines = [
+                f"\nSpot-Perp Funding Arbitrage Analysis (${POSITION_VALUE:,} position)",
+                "-" * 60,
+                "Strategy: Long spot + Short perp (market neutral)",
+            ]
+            for opp, net_profits in zip(top, grid):
+                lines.append(f"\n{opp['asset']} (Funding: {opp['funding_rate_pct']:+.4f}%):")
+                for h, net_profit in zip(PROFIT_HORIZONS, net_profits):
+                    lines.append(f"   {h}h profit: ${net_profit:+.2f} "
+                                 f"({net_profit / POSITION_VALUE * 100:+.3f}%)")
+            print("\n".join(lines))
+    finally:
+        await close_client()
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    run(main())
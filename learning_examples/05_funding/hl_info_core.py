@@ -0,0 +1,178 @@
+"""
+资金费率示例脚本共享的/info查询组件。
+
+复用_runtime中共享的httpx客户端，并提供请求限流与重试、带TTL的/info结果缓存，
+以及永续合约universe和assetCtxs的解析、资产网格的格式化。各示例脚本通过
+`from hl_info_core import ...` 复用这些组件，只保留各自的分析和输出逻辑。
+"""
+
+import asyncio
+import random
+import sys
+import time
+from dataclasses import dataclass
+from itertools import zip_longest
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+try:
+    import orjson
+except ImportError:
+    import json as orjson
+
+import httpx
+from hyperliquid.info import Info
+
+# 将learning_examples添加到路径以便导入共享模块
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from _cache import cached
+from _runtime import close_client, get_client, run
+
+# ---- 常量 ----
+
+MAX_CONCURRENT_REQUESTS = 64  # 每个主机同时在途的请求数上限
+RATE_LIMIT = 1200             # 每RATE_PERIOD秒最多发出的请求数
+RATE_PERIOD = 60.0
+RETRY_ATTEMPTS = 5
+RETRY_MIN_DELAY = 0.2
+RETRY_MAX_DELAY = 4.0
+
+INFO_CACHE_TTL = 5.0  # 同一次运行内重复的/info查询在5秒内直接复用
+UNIVERSE_TTL = 30.0   # universe很少变化；超过30秒或合约数量变化时重建
+
+# ---- 限流与重试 ----
+
+
+class HLLimiter:
+    """限制同时在途的请求数，并把请求发出的间隔控制在速率上限以内"""
+
+    def __init__(
+        self,
+        max_concurrent: int = MAX_CONCURRENT_REQUESTS,
+        rate_limit: int = RATE_LIMIT,
+        period: float = RATE_PERIOD,
+    ) -> None:
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+        self._interval = period / rate_limit
+        self._next_slot = 0.0
+
+    async def __aenter__(self) -> "HLLimiter":
+        await self._semaphore.acquire()
+        # 为本次请求预留下一个发送时间点，必要时等待到该时间点
+        now = time.monotonic()
+        slot = max(now, self._next_slot)
+        self._next_slot = slot + self._interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        self._semaphore.release()
+
+
+_limiter = HLLimiter()
+
+
+def _is_retryable(e: Exception) -> bool:
+    """超时、429和5xx值得重试；其他4xx是请求本身的问题，重试无用"""
+    if isinstance(e, httpx.HTTPStatusError):
+        status = e.response.status_code
+        return status == 429 or status >= 500
+    return isinstance(e, httpx.TimeoutException)
+
+
+async def send_with_retry(send: Callable[[], Awaitable[httpx.Response]]) -> httpx.Response:
+    """经限流器发送请求，失败时按带抖动的指数退避重试；非2xx响应抛出httpx.HTTPStatusError"""
+    for attempt in range(RETRY_ATTEMPTS):
+        try:
+            async with _limiter:
+                response = await send()
+            response.raise_for_status()
+            return response
+        except (httpx.TimeoutException, httpx.HTTPStatusError) as e:
+            if attempt == RETRY_ATTEMPTS - 1 or not _is_retryable(e):
+                raise
+            delay = min(RETRY_MAX_DELAY, RETRY_MIN_DELAY * 2 ** attempt)
+            await asyncio.sleep(random.uniform(0, delay))
+    raise AssertionError("unreachable")
+
+
+# ---- /info缓存 ----
+
+
+async def post_info(
+    base_url: Optional[str], payload: Dict[str, Any], ttl: float = INFO_CACHE_TTL
+) -> Any:
+    """POST /info，按(base_url, payload)缓存结果；非2xx响应抛出httpx.HTTPStatusError"""
+
+    async def _fetch() -> Any:
+        client = get_client()
+        response = await send_with_retry(
+            lambda: client.post(f"{base_url}/info", content=orjson.dumps(payload))
+        )
+        return orjson.loads(response.content)
+
+    return await cached((base_url, *sorted(payload.items())), ttl, _fetch)
+
+
+# ---- 永续合约universe与contexts ----
+
+
+class UniverseCache:
+    """永续合约universe的解析结果：名称列表及名称到下标的映射，与assetCtxs按下标对齐"""
+
+    def __init__(self) -> None:
+        self.names: List[str] = []
+        self.name_to_idx: Dict[str, int] = {}
+        self.loaded_at = 0.0
+
+    def update(self, meta: Dict) -> "UniverseCache":
+        """用metaAndAssetCtxs中的meta刷新缓存；未过期且合约数量不变时直接复用"""
+        universe = meta["universe"]
+        now = time.monotonic()
+        if len(universe) != len(self.names) or now - self.loaded_at > UNIVERSE_TTL:
+            self.names = [asset_info["name"] for asset_info in universe]
+            self.name_to_idx = {name: i for i, name in enumerate(self.names)}
+            self.loaded_at = now
+        return self
+
+
+universe = UniverseCache()
+
+
+@dataclass(slots=True)
+class AssetCtx:
+    """解析后的永续合约context：funding和markPx在获取时只转换一次"""
+    name: str
+    funding: float
+    mark_px: float
+
+
+def parse_asset_ctxs(names: Sequence[str], asset_ctxs: List[Dict]) -> List[AssetCtx]:
+    """把assetCtxs与universe名称按下标对齐并转换为AssetCtx"""
+    return [
+        AssetCtx(name, float(ctx.get("funding", "0")), float(ctx.get("markPx", "0")))
+        for name, ctx in zip(names, asset_ctxs)
+    ]
+
+
+async def get_meta_and_asset_ctxs(base_url: Optional[str]) -> Tuple[Dict, List[AssetCtx]]:
+    """通过SDK获取永续合约 (meta, 解析后的assetCtxs)，结果按INFO_CACHE_TTL缓存"""
+
+    async def _fetch() -> Tuple[Dict, List[AssetCtx]]:
+        info = await asyncio.to_thread(Info, base_url, skip_ws=True)
+        meta, asset_ctxs = await asyncio.to_thread(info.meta_and_asset_ctxs)
+        return meta, parse_asset_ctxs(universe.update(meta).names, asset_ctxs)
+
+    return await cached(("sdk", base_url, "metaAndAssetCtxs"), INFO_CACHE_TTL, _fetch)
+
+
+# ---- 输出 ----
+
+
+def format_asset_grid(assets: Iterable[str], per_row: int, width: int) -> List[str]:
+    """按字母顺序把资产排成每行per_row个的网格，返回各行文本"""
+    # zip_longest(*[it] * n) 把同一个迭代器每n个一组切成行，末行用空串补齐
+    rows = zip_longest(*[iter(sorted(assets))] * per_row, fillvalue="")
+    return ["   " + ", ".join(f"{asset:>{width}}" for asset in row if asset) for row in rows]
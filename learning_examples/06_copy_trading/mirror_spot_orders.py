@@ -5,21 +5,51 @@
 
 修复了使用同一钱包作为领导者/跟随者时的无限循环问题：
 - 添加消息队列以顺序处理WebSocket消息
-- 每条消息在下一条开始前完全处理
-- 防止跟随者订单在仍在下单时出现的竞态条件
+- 订单更新按币种分发到各自的队列，同一币种的消息在下一条开始前完全处理
+- 防止跟随者订单在仍在下单时出现的竞态条件（跟随者订单的更新总在其映射写入之后才被同一币种的worker处理）
+- 不同币种之间并行处理，互不阻塞
+
+跟随者的下单/撤单通过已建立的订阅WebSocket以post请求发送，不再为每个订单单独发起HTTPS请求。
 """
 
 import asyncio
-import json
+import logging
 import os
+import queue
 import signal
-from typing import Dict, Optional
+import sys
+import time
+from dataclasses import dataclass
+from logging.handlers import QueueHandler, QueueListener
+from decimal import Decimal
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+try:
+    import orjson
+except ImportError:
+    import json as orjson
+
 from dotenv import load_dotenv
+import requests
 import websockets
 from eth_account import Account
 from hyperliquid.exchange import Exchange
 from hyperliquid.info import Info
-from hyperliquid.utils.signing import OrderType as HLOrderType
+from hyperliquid.utils.constants import MAINNET_API_URL
+from hyperliquid.utils.error import Error as HyperliquidError
+from hyperliquid.utils.signing import (
+    float_to_wire,
+    get_timestamp_ms,
+    order_wires_to_order_action,
+    sign_l1_action,
+)
+from hyperliquid.utils.types import Cloid
+
+# Add learning_examples to the path to import the shared modules
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from _runtime import run
 
 load_dotenv()
 
@@ -31,9 +61,38 @@ BASE_URL = os.getenv("HYPERLIQUID_TESTNET_PUBLIC_BASE_URL")
 # Follower's orders will be ignored in the mirroring logic.
 LEADER_ADDRESS = os.getenv("TESTNET_WALLET_ADDRESS")
 FIXED_ORDER_VALUE_USDC = 15.0
+WS_POST_TIMEOUT = 5.0  # seconds to wait for a post response on the WebSocket
+MAX_BATCH_SIZE = 50  # orders/cancels per signed action
+SPOT_META_TTL = 3.0  # seconds to reuse spot meta/prices between leader orders
+MAX_CONCURRENT_POSTS = 4  # in-flight exchange actions, to stay under rate limits
+MAX_TRACKED_ORDERS = 10_000  # leader orders remembered by the stale-update guard
+MESSAGE_QUEUE_SIZE = 1024  # received messages waiting for the dispatcher
+COIN_QUEUE_SIZE = 256  # messages waiting for one coin's worker
+SPOT_ASSET_OFFSET = 10_000  # spot asset ids in exchange actions start at 10000
+RECONNECT_BASE_DELAY = 1.0  # first reconnect delay in seconds, doubled per failed attempt
+RECONNECT_MAX_DELAY = 30.0
+LOG_QUEUE_SIZE = 4096  # log records waiting for the writer thread; newer ones are dropped when full
+INFO_KEEPALIVE_INTERVAL = 15.0  # seconds between metadata refreshes that keep the HTTPS connection open
+SHUTDOWN_DRAIN_TIMEOUT = 10.0  # seconds the coin workers get to finish queued updates on shutdown
+GTC_ORDER_TYPE = {"limit": {"tif": "Gtc"}}  # order type wire, shared by every follower order
+
+# Subscription frames are encoded once at import; reconnects resend the same bytes
+ORDER_SUB_BYTES = orjson.dumps(
+    {"method": "subscribe", "subscription": {"type": "orderUpdates", "user": LEADER_ADDRESS}}
+)  # leader's order updates
+EVENTS_SUB_BYTES = orjson.dumps(
+    {"method": "subscribe", "subscription": {"type": "userEvents", "user": LEADER_ADDRESS}}
+)  # leader's user events (fills)
 
 running = False
 order_mappings: Dict[int, int] = {}  # leader_order_id -> follower_order_id
+follower_oids: Set[int] = set()  # values of order_mappings, for O(1) membership checks
+last_seen: Dict[int, Tuple[int, str]] = {}  # leader_order_id -> (statusTimestamp, status)
+_spot_meta_cache: Optional[Tuple[float, list]] = None  # (fetched_at, spot asset contexts)
+ASSET_META: Dict[str, "AssetMeta"] = {}  # "@index" and "PAIR/USDC" -> AssetMeta
+log = logging.getLogger(__name__)
+SHUTDOWN = object()  # Queue sentinel that wakes the dispatcher to check the stop event
+_request_shutdown: Optional[Callable[[], None]] = None  # Set while the mirror loop is running
 
 
 def signal_handler(signum, frame):
@@ -42,244 +101,447 @@ def signal_handler(signum, frame):
     global running
     print("\nShutting down...")
     running = False
+    if _request_shutdown is not None:
+        _request_shutdown()
 
 
-def detect_market_type(coin_field):
-    """Detect market type from coin field"""
-    if coin_field.startswith("@"):
-        return "SPOT"
-    elif "/" in coin_field:
-        return "SPOT"
-    else:
-        return "PERP"
+class DroppingQueueHandler(QueueHandler):
+    """QueueHandler that drops records instead of blocking when the queue is full"""
 
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            pass
 
-def is_spot_order(coin_field):
-    """Check if order is for spot trading - basic format validation only"""
-    if not coin_field or coin_field == "N/A":
-        return False
 
-    market_type = detect_market_type(coin_field)
-    if market_type != "SPOT":
-        return False
+def start_logging() -> QueueListener:
+    """Route log records through a bounded queue to a writer thread, so a slow stdout
+    never blocks the event loop; returns the started listener"""
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(logging.Formatter("%(message)s"))
+
+    log_queue: queue.Queue = queue.Queue(maxsize=LOG_QUEUE_SIZE)
+    log.addHandler(DroppingQueueHandler(log_queue))
+    log.setLevel(logging.DEBUG)
+    log.propagate = False
+
+    listener = QueueListener(log_queue, stream_handler)
+    listener.start()
+    return listener
+
+
+def post_shutdown(queue: asyncio.Queue, stop: asyncio.Event) -> None:
+    """Ask the dispatcher to stop once the messages already queued are handled; nothing is evicted"""
+    stop.set()
+    try:
+        queue.put_nowait(SHUTDOWN)  # Wakes a dispatcher idle in get()
+    except asyncio.QueueFull:
+        pass  # A full queue means the dispatcher is busy; it checks the stop event after each message
+
+
+class WsPostRouter:
+    """Send signed exchange actions as WebSocket post requests and match responses by id"""
+
+    def __init__(self, websocket, exchange: Exchange):
+        self.websocket = websocket
+        self.exchange = exchange
+        self._next_id = 0
+        self._pending: Dict[int, asyncio.Future] = {}
+        self._semaphore = asyncio.Semaphore(MAX_CONCURRENT_POSTS)
+        self._last_nonce = 0
+
+    def _signed_payload(self, action: dict) -> dict:
+        """Build the same payload Exchange._post_action sends to /exchange"""
+        exchange = self.exchange
+        # Posts signed in the same millisecond must not reuse a nonce
+        nonce = max(get_timestamp_ms(), self._last_nonce + 1)
+        self._last_nonce = nonce
+        signature = sign_l1_action(
+            exchange.wallet,
+            action,
+            exchange.vault_address,
+            nonce,
+            exchange.expires_after,
+            exchange.base_url == MAINNET_API_URL,
+        )
+        return {
+            "action": action,
+            "nonce": nonce,
+            "signature": signature,
+            "vaultAddress": exchange.vault_address,
+            "expiresAfter": exchange.expires_after,
+        }
+
+    async def post(self, action: dict, timeout: float = WS_POST_TIMEOUT) -> Any:
+        """Sign and send an action; returns the response payload ({"status": "ok", ...})"""
+        self._next_id += 1
+        req_id = self._next_id
+        future = asyncio.get_running_loop().create_future()
+        self._pending[req_id] = future
 
-    # Basic format validation for @index
-    if coin_field.startswith("@"):
         try:
-            asset_index = int(coin_field[1:])
-            # Only reject obviously invalid indices
-            if asset_index < 0:
-                return False
-        except ValueError:
-            return False
+            async with self._semaphore:
+                request = {
+                    "method": "post",
+                    "id": req_id,
+                    "request": {"type": "action", "payload": self._signed_payload(action)},
+                }
+                await self.websocket.send(orjson.dumps(request), text=True)
+                return await asyncio.wait_for(future, timeout=timeout)
+        finally:
+            self._pending.pop(req_id, None)
+
+    def resolve(self, data: dict) -> None:
+        """Complete the pending post matching a "post" channel message"""
+        message = data.get("data", {})
+        future = self._pending.get(message.get("id"))
+        if future is None or future.done():
+            return
+
+        response = message.get("response", {})
+        if response.get("type") == "error":
+            future.set_exception(RuntimeError(response.get("payload")))
+        else:
+            future.set_result(response.get("payload"))
+
+    async def bulk_orders(self, order_wires: List[dict]) -> Any:
+        """Place several pre-built order wires with one signed action (statuses come back in request order)"""
+        return await self.post(order_wires_to_order_action(order_wires))
+
+    async def bulk_cancel(self, cancels: List[dict]) -> Any:
+        """Cancel several orders ({"a": asset_id, "o": oid}) with one signed action"""
+        return await self.post({"type": "cancel", "cancels": cancels})
+
+
+def is_stale_update(leader_order_id: int, status: str, timestamp: int) -> bool:
+    """Check an update against the newest one seen for this leader order, recording it if newer"""
+    seen = last_seen.pop(leader_order_id, None)
+    if seen is not None and (timestamp < seen[0] or (timestamp, status) == seen):
+        last_seen[leader_order_id] = seen
+        return True
+
+    # Re-insert so the dict stays ordered oldest -> newest, then forget the oldest orders.
+    # Terminal states are kept too: they are what rejects a late replay of "open".
+    last_seen[leader_order_id] = (timestamp, status)
+    while len(last_seen) > MAX_TRACKED_ORDERS:
+        del last_seen[next(iter(last_seen))]
+    return False
+
+
+@dataclass(slots=True)
+class AssetMeta:
+    """Spot pair metadata needed to size a follower order"""
+    coin: str  # "@index" wire name
+    asset_idx: int  # position in the spot asset contexts
+    asset_id: int  # asset id used in exchange actions
+    sz_decimals: int
+
+
+def is_spot_order(coin_field):
+    """Check if order is for a known spot pair ("@index" or "PAIR/USDC")"""
+    return coin_field in ASSET_META
+
+
+async def get_spot_asset_ctxs(info: Info, ttl: float = SPOT_META_TTL) -> list:
+    """Return spot asset contexts, refreshing them and ASSET_META after ttl seconds"""
+    global _spot_meta_cache, ASSET_META
+    if _spot_meta_cache is not None and time.monotonic() - _spot_meta_cache[0] < ttl:
+        return _spot_meta_cache[1]
+
+    # Blocking SDK call - run in a thread so the WebSocket keeps draining
+    spot_meta, asset_ctxs = await asyncio.to_thread(info.spot_meta_and_asset_ctxs)
+    tokens = spot_meta.get("tokens", [])
+
+    asset_meta: Dict[str, AssetMeta] = {}
+    for pair in spot_meta.get("universe", []):
+        index = pair.get("index")
+        if not isinstance(index, int) or index < 0:
+            continue
+
+        # Size decimals come from the pair's base token
+        size_decimals = 6  # Default fallback
+        token_indices = pair.get("tokens", [])
+        if token_indices and token_indices[0] < len(tokens):
+            size_decimals = tokens[token_indices[0]].get("szDecimals", 6)
+
+        # Leader orders may name a pair either way; both keys share one entry
+        meta = AssetMeta(
+            coin=f"@{index}",
+            asset_idx=index,
+            asset_id=SPOT_ASSET_OFFSET + index,
+            sz_decimals=size_decimals,
+        )
+        asset_meta[meta.coin] = meta
+        if pair.get("name"):
+            asset_meta[pair["name"]] = meta
 
-    return True
+    ASSET_META = asset_meta
+    _spot_meta_cache = (time.monotonic(), asset_ctxs)
+    return asset_ctxs
 
 
 async def get_spot_asset_info(info: Info, coin_field: str) -> Optional[dict]:
     """Get spot asset price and metadata for proper order sizing"""
     try:
-        if coin_field.startswith("@"):
-            # For @index format, use spot API
-            spot_data = info.spot_meta_and_asset_ctxs()
-            if len(spot_data) >= 2:
-                spot_meta = spot_data[0]  # First element is metadata
-                asset_ctxs = spot_data[1]  # Second element is asset contexts
-
-                # Extract index number
-                index = int(coin_field[1:])
-                if index < len(asset_ctxs):
-                    ctx = asset_ctxs[index]
-                    # Try midPx first, fallback to markPx
-                    price = float(ctx.get("midPx", ctx.get("markPx", 0)))
-
-                    if price > 0:
-                        # Get token metadata for size decimals
-                        universe = spot_meta.get("universe", [])
-                        tokens = spot_meta.get("tokens", [])
-
-                        # Find the pair info
-                        pair_info = None
-                        for pair in universe:
-                            if pair.get("index") == index:
-                                pair_info = pair
-                                break
-
-                        # Get token info for size decimals
-                        size_decimals = 6  # Default fallback
-                        if pair_info and "tokens" in pair_info:
-                            token_indices = pair_info["tokens"]
-                            if len(token_indices) > 0:
-                                base_token_index = token_indices[0]
-                                if base_token_index < len(tokens):
-                                    token_info = tokens[base_token_index]
-                                    size_decimals = token_info.get("szDecimals", 6)
-
-                        return {
-                            "price": price,
-                            "szDecimals": size_decimals,
-                            "coin": coin_field,
-                        }
-                    else:
-                        print(
-                            f"⚠️ No spot price for {coin_field} (midPx={ctx.get('midPx')}, markPx={ctx.get('markPx')})"
-                        )
-                        return None
-                else:
-                    print(
-                        f"⚠️ Spot index {coin_field} out of range (max: @{len(asset_ctxs) - 1})"
-                    )
-                    return None
-
-        elif "/" in coin_field:
-            # For PAIR/USDC format, need to find the corresponding @index first
-            spot_meta = info.spot_meta()
-            universe = spot_meta.get("universe", [])
-
-            # Find the matching pair in spot universe
-            for pair_info in universe:
-                if pair_info.get("name") == coin_field:
-                    pair_index = pair_info.get("index")
-                    # Get info using the index
-                    return await get_spot_asset_info(info, f"@{pair_index}")
-
-            print(f"⚠️ Spot pair {coin_field} not found in universe")
+        asset_ctxs = await get_spot_asset_ctxs(info)
+
+        meta = ASSET_META.get(coin_field)
+        if meta is None:
+            log.warning(f"⚠️ Spot pair {coin_field} not found in universe")
             return None
 
-        else:
-            print(f"⚠️ Unsupported coin format for spot: {coin_field}")
+        if meta.asset_idx >= len(asset_ctxs):
+            log.warning(
+                f"⚠️ Spot index {coin_field} out of range (max: @{len(asset_ctxs) - 1})"
+            )
+            return None
+
+        ctx = asset_ctxs[meta.asset_idx]
+        # Try midPx first, fallback to markPx
+        price = float(ctx.get("midPx", ctx.get("markPx", 0)))
+
+        if price <= 0:
+            log.warning(
+                f"⚠️ No spot price for {coin_field} (midPx={ctx.get('midPx')}, markPx={ctx.get('markPx')})"
+            )
             return None
 
+        return {
+            "price": price,
+            "szDecimals": meta.sz_decimals,
+            "assetId": meta.asset_id,
+            "coin": coin_field,
+        }
+
     except Exception as e:
-        print(f"⚠️ Error getting spot info for {coin_field}: {e}")
+        log.warning(f"⚠️ Error getting spot info for {coin_field}: {e}")
         return None
 
 
-async def place_follower_order(
-    exchange: Exchange, info: Info, leader_order_data: dict
-) -> Optional[int]:
-    """Place corresponding follower order for spot trades"""
-    try:
-        coin_field = leader_order_data.get("coin", "")
-        side = leader_order_data.get("side")  # "B" or "A"
-        price = float(leader_order_data.get("limitPx", 0))
+async def keep_info_connection_warm(info: Info) -> None:
+    """Refresh spot metadata periodically so the Info session's pooled HTTPS connection stays
+    open between leader orders (and the next order usually finds fresh metadata)"""
+    while True:
+        await asyncio.sleep(INFO_KEEPALIVE_INTERVAL)
+        try:
+            await get_spot_asset_ctxs(info, ttl=0)
+        except Exception as e:
+            log.warning(f"⚠️ Metadata keep-alive failed: {e}")
 
-        if not is_spot_order(coin_field):
-            return None
+
+async def build_follower_order(
+    info: Info, leader_order_id: int, coin_field: str, side: str, limit_px: str
+) -> Optional[dict]:
+    """Size the follower order for a leader spot order; returns the order wire ready for signing,
+    tagged with a cloid derived from the leader order id"""
+    try:
+        price = float(limit_px or 0)
 
         # Get current asset info size decimals
         asset_info = await get_spot_asset_info(info, coin_field)
         if not asset_info:
-            print(f"❌ Could not get asset info for {coin_field}")
+            log.error(f"❌ Could not get asset info for {coin_field}")
             return None
 
-        # Round to proper precision based on asset's size decimals
-        order_size = round(FIXED_ORDER_VALUE_USDC / price, asset_info["szDecimals"])
+        # Quantize to whole size units (floor) and format exactly, without float rounding
+        sz_decimals = asset_info["szDecimals"]
+        size_units = int(FIXED_ORDER_VALUE_USDC * 10**sz_decimals / price)
 
-        if order_size <= 0:
-            print(f"❌ Invalid order size calculated for {coin_field}")
+        if size_units <= 0:
+            log.error(f"❌ Invalid order size calculated for {coin_field}")
             return None
 
+        # Normalized like float_to_wire ("1.5", "100"), which is what gets signed
+        order_size = f"{Decimal(size_units).scaleb(-sz_decimals).normalize():f}"
+
         is_buy = side == "B"
 
-        print(
+        log.info(
             f"🔄 Placing follower order: {'BUY' if is_buy else 'SELL'} {order_size} {coin_field} @ ${price}"
         )
 
-        # Place the order
-        result = exchange.order(
-            name=coin_field,
-            is_buy=is_buy,
-            sz=order_size,
-            limit_px=price,
-            order_type=HLOrderType({"limit": {"tif": "Gtc"}}),
-            reduce_only=False,
-        )
-
-        if result and result.get("status") == "ok":
-            response_data = result.get("response", {}).get("data", {})
-            statuses = response_data.get("statuses", [])
-
-            if statuses:
-                status_info = statuses[0]
-                if "resting" in status_info:
-                    follower_order_id = status_info["resting"]["oid"]
-                    print(f"✅ Follower order placed! ID: {follower_order_id}")
-                    return follower_order_id
-                elif "filled" in status_info:
-                    follower_order_id = status_info["filled"]["oid"]
-                    print(
-                        f"✅ Follower order filled immediately! ID: {follower_order_id}"
-                    )
-                    return follower_order_id
-
-        print(f"❌ Failed to place follower order: {result}")
-        return None
+        # Same fields and order as the SDK's order_request_to_order_wire, without the name lookup
+        return {
+            "a": asset_info["assetId"],
+            "b": is_buy,
+            "p": float_to_wire(price),
+            "s": order_size,
+            "r": False,
+            "t": GTC_ORDER_TYPE,
+            "c": Cloid.from_int(leader_order_id).to_raw(),
+        }
 
     except Exception as e:
-        print(f"❌ Error placing follower order: {e}")
+        log.error(f"❌ Error building follower order: {e}")
         return None
 
 
-async def cancel_follower_order(
-    exchange: Exchange, follower_order_id: int, coin_field: str
-) -> bool:
-    """Cancel follower order"""
-    try:
-        print("🔄 Cancelling follower order ID:", follower_order_id)
+async def find_orders_by_cloid(
+    info: Info, follower_address: str, leader_order_ids: List[int]
+) -> Dict[int, int]:
+    """Look up follower orders whose post timed out by their cloid; returns leader -> follower ids
+    for the orders the exchange accepted"""
+    results = await asyncio.gather(
+        *(
+            asyncio.to_thread(
+                info.query_order_by_cloid, follower_address, Cloid.from_int(leader_order_id)
+            )
+            for leader_order_id in leader_order_ids
+        ),
+        return_exceptions=True,
+    )
+
+    found: Dict[int, int] = {}
+    for leader_order_id, result in zip(leader_order_ids, results):
+        if isinstance(result, Exception) or result.get("status") != "order":
+            log.error(f"❌ No follower order found for {leader_order_id} after timeout: {result}")
+            continue
+        follower_order_id = result["order"]["order"]["oid"]
+        log.info(f"✅ Follower order found after timeout! ID: {follower_order_id}")
+        found[leader_order_id] = follower_order_id
+    return found
+
+
+async def place_follower_orders(
+    router: WsPostRouter, info: Info, leader_orders: List[Tuple[int, str, str, str]]
+) -> Dict[int, int]:
+    """Place follower orders for (leader_order_id, coin, side, limitPx) entries, one signed action
+    per batch; returns leader -> follower ids"""
+    leader_order_ids = []
+    order_wires = []
+    for leader_order_id, coin_field, side, limit_px in leader_orders:
+        order_wire = await build_follower_order(info, leader_order_id, coin_field, side, limit_px)
+        if order_wire:
+            leader_order_ids.append(leader_order_id)
+            order_wires.append(order_wire)
+
+    placed: Dict[int, int] = {}
+
+    for start in range(0, len(order_wires), MAX_BATCH_SIZE):
+        batch_leader_ids = leader_order_ids[start:start + MAX_BATCH_SIZE]
+        try:
+            result = await router.bulk_orders(order_wires[start:start + MAX_BATCH_SIZE])
+        except asyncio.TimeoutError:
+            # The action may still have been accepted, so record whatever was actually placed
+            log.warning("⚠️ Follower order post timed out, checking order status by cloid")
+            placed.update(
+                await find_orders_by_cloid(info, router.exchange.wallet.address, batch_leader_ids)
+            )
+            continue
+        except Exception as e:
+            log.error(f"❌ Error placing follower orders: {e}")
+            continue
 
-        result = exchange.cancel(name=coin_field, oid=follower_order_id)
+        statuses = []
+        if result and result.get("status") == "ok":
+            statuses = result.get("response", {}).get("data", {}).get("statuses", [])
+
+        if not statuses:
+            log.error(f"❌ Failed to place follower orders: {result}")
+            continue
+
+        # Statuses are returned in the same order as the submitted orders
+        for leader_order_id, status_info in zip(batch_leader_ids, statuses):
+            if "resting" in status_info:
+                follower_order_id = status_info["resting"]["oid"]
+                log.info(f"✅ Follower order placed! ID: {follower_order_id}")
+            elif "filled" in status_info:
+                follower_order_id = status_info["filled"]["oid"]
+                log.info(f"✅ Follower order filled immediately! ID: {follower_order_id}")
+            else:
+                log.error(f"❌ Failed to place follower order for {leader_order_id}: {status_info}")
+                continue
+            placed[leader_order_id] = follower_order_id
+
+    return placed
+
+
+async def cancel_follower_orders(router: WsPostRouter, cancels: List[dict]) -> None:
+    """Cancel follower orders ({"a": asset_id, "o": oid}), one signed action per batch"""
+    for start in range(0, len(cancels), MAX_BATCH_SIZE):
+        batch = cancels[start:start + MAX_BATCH_SIZE]
+        log.info(f"🔄 Cancelling follower order IDs: {[c['o'] for c in batch]}")
+
+        try:
+            result = await router.bulk_cancel(batch)
+        except Exception as e:
+            log.error(f"❌ Error cancelling follower orders: {e}")
+            continue
 
         if result and result.get("status") == "ok":
-            print("✅ Follower order cancelled successfully")
-            return True
+            log.info(f"✅ {len(batch)} follower order(s) cancelled successfully")
         else:
-            print(f"❌ Failed to cancel follower order: {result}")
-            return False
-
-    except Exception as e:
-        print(f"❌ Error cancelling follower order: {e}")
-        return False
+            log.error(f"❌ Failed to cancel follower orders: {result}")
 
 
-async def handle_leader_order_events(data: dict, exchange: Exchange, info: Info):
+async def handle_leader_order_events(data: dict, router: WsPostRouter, info: Info):
     """Process leader's order-related WebSocket events"""
     channel = data.get("channel")
 
     if channel == "orderUpdates":
         orders = data.get("data", [])
+        to_place = []   # (leader_order_id, coin, side, limitPx) to mirror
+        to_cancel = []  # follower orders to cancel
+        followers = follower_oids
+        mappings = order_mappings
+        asset_meta = ASSET_META
+
         for order_update in orders:
-            order = order_update.get("order", {})
-            status = order_update.get("status", "unknown")
-            coin_field = order.get("coin", "")
+            # Extract every field once up front
+            order = order_update.get("order") or {}
+            coin_field = order.get("coin") or ""
 
             # Only process valid spot orders
-            if not is_spot_order(coin_field):
+            if coin_field not in asset_meta:
                 continue
 
+            status = order_update.get("status", "unknown")
             leader_order_id = order.get("oid")
+            side = order.get("side")
+            limit_px = order.get("limitPx")
 
             # Skip follower orders, but allow processing of known leader orders for cancellation/modification
-            if leader_order_id in order_mappings.values():
-                print(f"DEBUG: Skipping follower order {leader_order_id}:{status}")
+            if leader_order_id in followers:
+                log.debug(f"DEBUG: Skipping follower order {leader_order_id}:{status}")
                 continue
 
-            print(
-                f"LEADER ORDER {status.upper()}: {order.get('side')} {order.get('sz')} {coin_field} @ {order.get('limitPx')} (ID: {leader_order_id})"
+            # Drop snapshots/replays older than what we've already acted on (e.g. after a reconnect)
+            timestamp = order_update.get("statusTimestamp") or order.get("timestamp") or 0
+            if is_stale_update(leader_order_id, status, timestamp):
+                log.debug(f"DEBUG: Skipping stale update {leader_order_id}:{status}")
+                continue
+
+            log.info(
+                f"LEADER ORDER {status.upper()}: {side} {order.get('sz')} {coin_field} @ {limit_px} (ID: {leader_order_id})"
             )
 
             if status == "open":
                 # New order - mirror it
-                follower_order_id = await place_follower_order(exchange, info, order)
-                if follower_order_id:
-                    order_mappings[leader_order_id] = follower_order_id
-                    print(f"Mapped {leader_order_id} -> {follower_order_id}")
+                to_place.append((leader_order_id, coin_field, side, limit_px))
+
+            elif status == "canceled":
+                if leader_order_id in mappings:
+                    follower_order_id = mappings.pop(leader_order_id)
+                    followers.discard(follower_order_id)
+                    if follower_order_id > 0:
+                        to_cancel.append(
+                            {"a": asset_meta[coin_field].asset_id, "o": follower_order_id}
+                        )
+                else:
+                    # Opened and canceled within this message - nothing to mirror
+                    to_place = [p for p in to_place if p[0] != leader_order_id]
 
-            elif status == "canceled" and leader_order_id in order_mappings:
-                follower_order_id = order_mappings[leader_order_id]
-                if follower_order_id > 0:
-                    await cancel_follower_order(exchange, follower_order_id, coin_field)
-                del order_mappings[leader_order_id]
+        # Mirror the whole message with at most one cancel and one order action per batch
+        if to_cancel:
+            await cancel_follower_orders(router, to_cancel)
+
+        if to_place:
+            placed = await place_follower_orders(router, info, to_place)
+            for leader_order_id, follower_order_id in placed.items():
+                order_mappings[leader_order_id] = follower_order_id
+                follower_oids.add(follower_order_id)
+                log.info(f"Mapped {leader_order_id} -> {follower_order_id}")
 
     elif channel == "user":
         user_data = data.get("data", {})
@@ -289,110 +551,315 @@ async def handle_leader_order_events(data: dict, exchange: Exchange, info: Info)
             coin_field = fill.get("coin", "N/A")
             if is_spot_order(coin_field):
                 fill_order_id = fill.get("oid")
-                if fill_order_id and fill_order_id in order_mappings.values():
+                if fill_order_id and fill_order_id in follower_oids:
                     continue
                 side = "BUY" if fill.get("side") == "B" else "SELL"
-                print(
+                log.info(
                     f"LEADER FILL: {side} {fill.get('sz')} {coin_field} @ {fill.get('px')}"
                 )
 
     elif channel == "subscriptionResponse":
-        print("✅ WebSocket subscription confirmed")
+        log.info("✅ WebSocket subscription confirmed")
+
+
+async def resync_order_state(
+    info: Info, follower_address: str, mirror_started_at: int
+) -> List[dict]:
+    """Reconcile order_mappings with REST after a reconnect; returns synthetic order updates
+    for leader changes missed while disconnected"""
+    leader_open, follower_open = await asyncio.gather(
+        asyncio.to_thread(info.open_orders, LEADER_ADDRESS),
+        asyncio.to_thread(info.open_orders, follower_address),
+    )
+    leader_open_oids = {o["oid"] for o in leader_open}
+    follower_open_oids = {o["oid"] for o in follower_open}
+
+    # Follower orders that filled or were cancelled meanwhile need no further mirroring
+    for leader_order_id, follower_order_id in list(order_mappings.items()):
+        if follower_order_id not in follower_open_oids:
+            del order_mappings[leader_order_id]
+            follower_oids.discard(follower_order_id)
+
+    # Mapped leader orders that are no longer open: fetch their final status so the
+    # normal handler cancels the orphaned follower order
+    updates = []
+    for leader_order_id in [oid for oid in order_mappings if oid not in leader_open_oids]:
+        result = await asyncio.to_thread(info.query_order_by_oid, LEADER_ADDRESS, leader_order_id)
+        if result.get("status") == "order":
+            updates.append(result["order"])
+
+    # Open leader orders the stream never delivered (placed while disconnected, or whose
+    # frame was lost just before the drop) are neither mapped nor in last_seen. Orders older
+    # than the mirror itself were never meant to be copied
+    for order in leader_open:
+        oid = order["oid"]
+        if (
+            oid not in order_mappings
+            and oid not in last_seen
+            and order.get("timestamp", 0) >= mirror_started_at
+        ):
+            updates.append(
+                {"order": order, "status": "open", "statusTimestamp": order["timestamp"]}
+            )
+
+    return updates
+
+
+async def run_mirror_session(
+    websocket, exchange: Exchange, info: Info, resync_updates: List[dict]
+) -> None:
+    """Mirror leader orders over one WebSocket connection until shutdown or disconnect"""
+    global _request_shutdown
+
+    message_queue = asyncio.Queue(maxsize=MESSAGE_QUEUE_SIZE)
+    if resync_updates:
+        # Reconciled state from REST goes first, through the same per-coin workers
+        message_queue.put_nowait({"channel": "orderUpdates", "data": resync_updates})
+    router = WsPostRouter(websocket, exchange)
+
+    # The signal handler runs outside the loop's callbacks, so hand the sentinel over
+    # thread-safely; this also wakes a loop that is idle in select()
+    loop = asyncio.get_running_loop()
+    stop = asyncio.Event()
+    _request_shutdown = lambda: loop.call_soon_threadsafe(post_shutdown, message_queue, stop)
+    if not running:
+        post_shutdown(message_queue, stop)  # Ctrl+C arrived while connecting
+
+    # While the queue is full, order updates are coalesced here: only the newest update
+    # per leader order is kept (e.g. a pending "open" is replaced by its "canceled")
+    overflow: Dict[Any, dict] = {}
+
+    def flush_overflow():
+        if overflow and not message_queue.full():
+            message_queue.put_nowait(
+                {"channel": "orderUpdates", "data": list(overflow.values())}
+            )
+            overflow.clear()
+
+    def enqueue(data: dict):
+        flush_overflow()
+        # Once anything is pending in overflow, newer messages must not overtake it
+        if not overflow:
+            try:
+                message_queue.put_nowait(data)
+                return
+            except asyncio.QueueFull:
+                pass
+
+        if data.get("channel") == "orderUpdates":
+            for order_update in data.get("data", []):
+                overflow[order_update.get("order", {}).get("oid")] = order_update
+        else:
+            log.warning(f"⚠️ Queue full, dropping {data.get('channel')} message")
+
+    # Task to receive messages and put them in queue
+    async def message_receiver():
+        try:
+            while True:
+                # Raw bytes skip the UTF-8 decode; orjson parses bytes directly
+                message = await websocket.recv(decode=False)
+
+                try:
+                    data = orjson.loads(message)
+                except orjson.JSONDecodeError:
+                    log.warning("⚠️ Received invalid JSON")
+                    continue
+
+                # Post responses are resolved here rather than queued: the processor
+                # is usually the one awaiting them. After a stop request the socket is
+                # still read so the workers' final posts get their responses, but new
+                # leader messages are no longer queued
+                if data.get("channel") == "post":
+                    router.resolve(data)
+                elif not stop.is_set():
+                    enqueue(data)
+        finally:
+            # Stop the dispatcher when the socket closes as well
+            post_shutdown(message_queue, stop)
+
+    # One queue + worker per coin: updates for a coin are handled strictly in order,
+    # while different coins no longer wait on each other's exchange round trips
+    coin_queues: Dict[str, asyncio.Queue] = {}
+    coin_workers: List[asyncio.Task] = []
+
+    async def coin_worker(queue: asyncio.Queue):
+        while True:
+            data = await queue.get()
+            try:
+                # Process message completely before moving to next for this coin
+                await handle_leader_order_events(data, router, info)
+            except Exception as e:
+                log.error(f"❌ Error processing message: {e}")
+            finally:
+                queue.task_done()
+
+    async def route_order_updates(data: dict):
+        """Split an orderUpdates message by coin and queue each part on its coin's worker"""
+        by_coin: Dict[str, list] = {}
+        for order_update in data.get("data", []):
+            coin_field = order_update.get("order", {}).get("coin", "")
+            by_coin.setdefault(coin_field, []).append(order_update)
+
+        for coin_field, updates in by_coin.items():
+            queue = coin_queues.get(coin_field)
+            if queue is None:
+                queue = coin_queues[coin_field] = asyncio.Queue(maxsize=COIN_QUEUE_SIZE)
+                coin_workers.append(asyncio.create_task(coin_worker(queue)))
+            # A backed-up coin pushes back on the dispatcher, so overload ends up
+            # coalesced in overflow instead of growing queues without bound
+            await queue.put({"channel": "orderUpdates", "data": updates})
+
+    # Task to dispatch messages from queue
+    async def message_dispatcher():
+        while True:
+            # Sleeps until a message or the SHUTDOWN sentinel arrives
+            data = await message_queue.get()
+            if data is SHUTDOWN:
+                message_queue.task_done()
+                flush_overflow()
+                # Updates queued before the stop request are still mirrored
+                if message_queue.empty():
+                    break
+                continue
+
+            try:
+                # print(f"RAW MESSAGE: {data}")
+                # print("-" * 40)
+
+                if data.get("channel") == "orderUpdates":
+                    await route_order_updates(data)
+                else:
+                    # Fills and confirmations are only logged
+                    await handle_leader_order_events(data, router, info)
+            except Exception as e:
+                log.error(f"❌ Error processing message: {e}")
+            finally:
+                message_queue.task_done()
+                flush_overflow()
+
+            # Flushing refills an empty queue from overflow, so empty means fully drained
+            if stop.is_set() and message_queue.empty():
+                break
+
+    # Run both tasks concurrently; the receiver keeps resolving post responses until
+    # the coin queues have drained, and is then cancelled rather than awaited
+    receiver_task = asyncio.create_task(message_receiver())
+    keepalive_task = asyncio.create_task(keep_info_connection_warm(info))
+    try:
+        await message_dispatcher()
+        # Let the coin workers finish what was routed to them (e.g. the leader's last cancels)
+        try:
+            await asyncio.wait_for(
+                asyncio.gather(*(queue.join() for queue in coin_queues.values())),
+                timeout=SHUTDOWN_DRAIN_TIMEOUT,
+            )
+        except asyncio.TimeoutError:
+            log.warning("⚠️ Timed out waiting for queued order updates")
+        if receiver_task.done():
+            receiver_task.result()  # Re-raise ConnectionClosed and friends
+    finally:
+        _request_shutdown = None
+        receiver_task.cancel()
+        keepalive_task.cancel()
+        for worker in coin_workers:
+            worker.cancel()
 
 
 async def monitor_and_mirror_spot_orders():
-    """Connect to WebSocket and monitor leader's spot order activity"""
-    global running
+    """Connect to WebSocket and monitor leader's spot order activity, reconnecting with backoff"""
+    global running, _request_shutdown
 
     private_key = os.getenv("HYPERLIQUID_TESTNET_PRIVATE_KEY")
     if not private_key:
-        print("❌ Missing HYPERLIQUID_TESTNET_PRIVATE_KEY in .env file")
+        log.error("❌ Missing HYPERLIQUID_TESTNET_PRIVATE_KEY in .env file")
         return
 
     # Initialize follower trading components
     try:
         wallet = Account.from_key(private_key)
-        exchange = Exchange(wallet, BASE_URL)
-        info = Info(BASE_URL, skip_ws=True)
-        print(f"✅ Follower wallet initialized: {wallet.address}")
+        # Both constructors fetch metadata over blocking HTTP - run them in threads concurrently
+        exchange, info = await asyncio.gather(
+            asyncio.to_thread(Exchange, wallet, BASE_URL),
+            asyncio.to_thread(Info, BASE_URL, skip_ws=True),
+        )
+        log.info(f"✅ Follower wallet initialized: {wallet.address}")
+
+        # Load spot pair metadata up front: is_spot_order looks coins up in ASSET_META
+        await get_spot_asset_ctxs(info)
+        log.info(f"✅ Loaded {len(ASSET_META)} spot pair names")
     except Exception as e:
-        print(f"❌ Failed to initialize follower wallet: {e}")
+        log.error(f"❌ Failed to initialize follower wallet: {e}")
         return
 
-    print(f"🔗 Connecting to {WS_URL}")
     signal.signal(signal.SIGINT, signal_handler)
+    running = True
+    loop = asyncio.get_running_loop()
+    reconnect_delay = RECONNECT_BASE_DELAY
+    mirror_started_at: Optional[int] = None  # ms timestamp of the first subscription
 
     try:
-        async with websockets.connect(WS_URL) as websocket:
-            print("✅ WebSocket connected!")
-
-            # Subscribe to leader's order updates
-            order_subscription = {
-                "method": "subscribe",
-                "subscription": {"type": "orderUpdates", "user": LEADER_ADDRESS},
-            }
-
-            # Subscribe to leader's user events (fills)
-            events_subscription = {
-                "method": "subscribe",
-                "subscription": {"type": "userEvents", "user": LEADER_ADDRESS},
-            }
-
-            await websocket.send(json.dumps(order_subscription))
-            await websocket.send(json.dumps(events_subscription))
-
-            print(f"📊 Monitoring SPOT orders for leader: {LEADER_ADDRESS}")
-            print(f"💰 Fixed order value: ${FIXED_ORDER_VALUE_USDC} USDC per order")
-            print(f"👤 Follower wallet: {wallet.address}")
-            print("=" * 80)
-
-            running = True
-            message_queue = asyncio.Queue()
-
-            # Task to receive messages and put them in queue
-            async def message_receiver():
-                async for message in websocket:
-                    if not running:
-                        break
-                    await message_queue.put(message)
-
-            # Task to process messages one by one from queue
-            async def message_processor():
-                while running:
-                    try:
-                        # Wait for next message with timeout
-                        message = await asyncio.wait_for(
-                            message_queue.get(), timeout=1.0
+        while running:
+            log.info(f"🔗 Connecting to {WS_URL}")
+            try:
+                # Small JSON frames aren't worth zlib compression
+                async with websockets.connect(WS_URL, compression=None) as websocket:
+                    log.info("✅ WebSocket connected!")
+                    reconnect_delay = RECONNECT_BASE_DELAY
+
+                    # Pre-encoded bytes go out as text frames, which is what the API expects
+                    await websocket.send(ORDER_SUB_BYTES, text=True)
+                    await websocket.send(EVENTS_SUB_BYTES, text=True)
+                    first_connection = mirror_started_at is None
+                    if first_connection:
+                        mirror_started_at = get_timestamp_ms()
+
+                    # Warm the HTTPS connection (and metadata) before the first mirrored order
+                    await get_spot_asset_ctxs(info, ttl=0)
+
+                    resync_updates: List[dict] = []
+                    if not first_connection:
+                        resync_updates = await resync_order_state(
+                            info, wallet.address, mirror_started_at
+                        )
+                        log.info(
+                            f"🔄 Resynced after reconnect: {len(order_mappings)} mappings, "
+                            f"{len(resync_updates)} missed update(s)"
                         )
 
-                        try:
-                            data = json.loads(message)
+                    log.info(f"📊 Monitoring SPOT orders for leader: {LEADER_ADDRESS}")
+                    log.info(f"💰 Fixed order value: ${FIXED_ORDER_VALUE_USDC} USDC per order")
+                    log.info(f"👤 Follower wallet: {wallet.address}")
+                    log.info("=" * 80)
+
+                    await run_mirror_session(websocket, exchange, info, resync_updates)
 
-                            # print(f"RAW MESSAGE: {json.dumps(data, indent=2)}")
-                            # print("-" * 40)
+            except (websockets.exceptions.WebSocketException, OSError) as e:
+                log.info(f"🔌 WebSocket connection lost: {e}")
+            except (HyperliquidError, requests.RequestException) as e:
+                # 429/5xx or network errors from the metadata refresh or resync: retry with backoff
+                log.warning(f"⚠️ REST request failed while connecting: {e}")
 
-                            # Process message completely before moving to next
-                            await handle_leader_order_events(data, exchange, info)
-                        except json.JSONDecodeError:
-                            print("⚠️ Received invalid JSON")
-                        except Exception as e:
-                            print(f"❌ Error processing message: {e}")
-                        finally:
-                            message_queue.task_done()
+            if not running:
+                break
 
-                    except asyncio.TimeoutError:
-                        continue  # No message received, continue loop
+            log.info(f"⏳ Reconnecting in {reconnect_delay:.0f}s...")
 
-            # Run both tasks concurrently
-            await asyncio.gather(message_receiver(), message_processor())
+            # Sleep out the backoff, but wake immediately on Ctrl+C
+            wake = asyncio.Event()
+            _request_shutdown = lambda: loop.call_soon_threadsafe(wake.set)
+            try:
+                await asyncio.wait_for(wake.wait(), timeout=reconnect_delay)
+            except asyncio.TimeoutError:
+                pass
+            finally:
+                _request_shutdown = None
+            reconnect_delay = min(reconnect_delay * 2, RECONNECT_MAX_DELAY)
 
-    except websockets.exceptions.ConnectionClosed:
-        print("🔌 WebSocket connection closed")
     except Exception as e:
-        print(f"❌ WebSocket error: {e}")
+        log.error(f"❌ WebSocket error: {e}")
     finally:
-        print("👋 Disconnected")
-        print(f"📊 Final order mappings: {len(order_mappings)} active")
+        log.info("👋 Disconnected")
+        log.info(f"📊 Final order mappings: {len(order_mappings)} active")
 
 
 async def main():
@@ -409,8 +876,12 @@ async def main():
         print("❌ Please set LEADER_ADDRESS in the script")
         return
 
-    await monitor_and_mirror_spot_orders()
+    listener = start_logging()
+    try:
+        await monitor_and_mirror_spot_orders()
+    finally:
+        listener.stop()  # Flushes queued records
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    run(main())
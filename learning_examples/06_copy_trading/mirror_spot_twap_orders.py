@@ -5,16 +5,23 @@
 
 TWAP跟踪（用于使用同一钱包作为领导者和跟随者的测试）：
 - WebSocket事件不包括TWAP ID，仅TWAP属性（币种、方向、大小等）
-- 使用组合键（coin_side_minutes_randomize_size）检测重复
+- 使用组合键元组（coin, side, minutes, randomize, size）检测重复
 - 单独跟踪领导者vs跟随者组合，因为跟随者调整大小
 - 防止将我们自己的跟随者TWAP作为新的领导者订单处理
 """
 
 import asyncio
-import json
 import os
 import signal
-from typing import Dict, Optional
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Set, Tuple
+
+try:
+    import orjson
+except ImportError:
+    import json as orjson
+
 from dotenv import load_dotenv
 import websockets
 from eth_account import Account
@@ -32,11 +39,79 @@ BASE_URL = os.getenv("HYPERLIQUID_TESTNET_PUBLIC_BASE_URL")
 # Follower's TWAPs will be ignored in the mirroring logic.
 LEADER_ADDRESS = os.getenv("TESTNET_WALLET_ADDRESS")
 FIXED_ORDER_VALUE_USDC = 60.0
+SPOT_META_TTL = 60.0  # universe/tokens change rarely
+SPOT_CTXS_TTL = 2.0   # asset contexts carry midPx, keep them fresh
+MAX_TRACKED_TWAPS = 10_000     # entries per tracking container before the oldest are evicted
+TRACKING_MAX_AGE = 25 * 3600   # seconds; longer than the 24h maximum TWAP duration
+TRACKING_SWEEP_INTERVAL = 60.0
+MAX_CONCURRENT_POSTS = 4  # signed exchange requests in flight at once
+
+
+class LRUDict:
+    """Insertion-ordered dict capped at maxsize; setting a key refreshes it, the oldest keys are
+    evicted first, and sweep() drops keys not refreshed within max_age seconds"""
+
+    def __init__(self, maxsize: int = MAX_TRACKED_TWAPS):
+        self.maxsize = maxsize
+        self._data: "OrderedDict[Any, Tuple[float, Any]]" = OrderedDict()  # key -> (set_at, value)
+
+    def __contains__(self, key) -> bool:
+        return key in self._data
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __getitem__(self, key):
+        return self._data[key][1]
+
+    def __setitem__(self, key, value) -> None:
+        data = self._data
+        data[key] = (time.monotonic(), value)
+        data.move_to_end(key)
+        while len(data) > self.maxsize:
+            data.popitem(last=False)
+
+    def __delitem__(self, key) -> None:
+        del self._data[key]
+
+    def get(self, key, default=None):
+        entry = self._data.get(key)
+        return entry[1] if entry is not None else default
+
+    def pop(self, key, default=None):
+        entry = self._data.pop(key, None)
+        return entry[1] if entry is not None else default
+
+    def add(self, key) -> None:
+        """Set-style insert, for containers that only track membership"""
+        self[key] = None
+
+    def discard(self, key) -> None:
+        self._data.pop(key, None)
+
+    def sweep(self, max_age: float = TRACKING_MAX_AGE) -> int:
+        """Drop entries older than max_age seconds; returns how many were removed"""
+        data = self._data
+        cutoff = time.monotonic() - max_age
+        removed = 0
+        # Oldest entries are at the front, so stop at the first fresh one
+        while data and next(iter(data.values()))[0] < cutoff:
+            data.popitem(last=False)
+            removed += 1
+        return removed
+
 
 running = False
-leader_twap_combinations: set = set()      # Track processed leader TWAPs with size
-follower_twap_combinations: set = set()    # Track our placed follower TWAPs with adjusted size
-twap_mappings: Dict[str, int] = {}         # leader_combination -> follower_twap_id
+# (coin, side, minutes, randomize, size) - tuples hash without building a string per event
+TwapCombination = Tuple[str, str, int, bool, Any]
+
+leader_twap_combinations = LRUDict()      # Track processed leader TWAPs with size
+# Track our placed follower TWAPs: (coin, side, minutes, randomize) -> adjusted sizes
+follower_twap_combinations = LRUDict()
+twap_mappings = LRUDict()                 # leader_combination -> (follower_twap_id, follower_size)
+_meta_cache: Dict[str, Tuple[float, Any]] = {}  # key -> (fetched_at, data)
+_meta_locks: Dict[str, asyncio.Lock] = {}
+_post_semaphore = asyncio.Semaphore(MAX_CONCURRENT_POSTS)
 
 
 def signal_handler(signum, frame):
@@ -47,140 +122,153 @@ def signal_handler(signum, frame):
     running = False
 
 
-def detect_market_type(coin_field):
-    """Detect market type from coin field"""
-    if coin_field.startswith("@"):
-        return "SPOT"
-    elif "/" in coin_field:
-        return "SPOT"
-    else:
-        return "PERP"
+async def _cached(key: str, ttl: float, fetch: Callable[[], Any]) -> Any:
+    """Return fetch() cached for ttl seconds; concurrent misses for a key share one request"""
+    entry = _meta_cache.get(key)
+    if entry is not None and time.monotonic() - entry[0] < ttl:
+        return entry[1]
+
+    lock = _meta_locks.setdefault(key, asyncio.Lock())
+    async with lock:
+        # Another task may have refreshed the entry while we waited for the lock
+        entry = _meta_cache.get(key)
+        if entry is not None and time.monotonic() - entry[0] < ttl:
+            return entry[1]
+
+        # Blocking SDK call - run in a thread so the WebSocket keeps draining
+        data = await asyncio.to_thread(fetch)
+        _meta_cache[key] = (time.monotonic(), data)
+        return data
+
+
+def _sign_and_post(exchange: Exchange, action: dict) -> Any:
+    """Sign an L1 action and send it to /exchange (blocking)"""
+    timestamp = get_timestamp_ms()
+    signature = sign_l1_action(
+        exchange.wallet,
+        action,
+        exchange.vault_address,
+        timestamp,
+        exchange.expires_after,
+        False,
+    )
+    return exchange._post_action(action, signature, timestamp)
+
+
+async def post_action(exchange: Exchange, action: dict) -> Any:
+    """Sign and send an action in a worker thread so the WebSocket keeps draining meanwhile"""
+    async with _post_semaphore:
+        return await asyncio.to_thread(_sign_and_post, exchange, action)
 
 
 def is_spot_order(coin_field):
-    """Check if order is for spot trading - basic format validation only"""
-    if not coin_field or coin_field == "N/A":
-        return False
+    """Check if order is for spot trading ("@index" or "PAIR/USDC") - basic format validation only"""
+    return (coin_field[:1] == "@" and coin_field[1:].isdigit()) or "/" in coin_field
 
-    market_type = detect_market_type(coin_field)
-    if market_type != "SPOT":
-        return False
 
-    # Basic format validation for @index
-    if coin_field.startswith("@"):
-        try:
-            asset_index = int(coin_field[1:])
-            # Only reject obviously invalid indices
-            if asset_index < 0:
-                return False
-        except ValueError:
-            return False
+def create_leader_twap_combination(state: dict) -> TwapCombination:
+    """Create leader TWAP combination key with original size (the wire string)"""
+    return (
+        state.get("coin", ""),
+        state.get("side"),
+        state.get("minutes", 1),
+        state.get("randomize", False),
+        state.get("sz", "0"),
+    )
 
-    return True
 
+def create_follower_twap_combination(coin_field: str, side: str, minutes: int, randomize: bool, follower_size: float) -> TwapCombination:
+    """Create follower TWAP combination key with adjusted size"""
+    return (coin_field, side, minutes, randomize, follower_size)
 
-def create_leader_twap_combination(state: dict) -> str:
-    """Create leader TWAP combination ID with original size"""
-    coin_field = state.get("coin", "")
-    side = state.get("side")
-    minutes = state.get("minutes", 1)
-    randomize = state.get("randomize", False)
-    size = state.get("sz", "0")
 
-    return f"{coin_field}_{side}_{minutes}_{randomize}_{size}"
+def format_combination(combination: TwapCombination) -> str:
+    """coin_side_minutes_randomize_size form of a combination, for log output"""
+    return "_".join(map(str, combination))
 
 
-def create_follower_twap_combination(coin_field: str, side: str, minutes: int, randomize: bool, follower_size: float) -> str:
-    """Create follower TWAP combination ID with adjusted size"""
-    return f"{coin_field}_{side}_{minutes}_{randomize}_{follower_size}"
+def build_spot_index(spot_meta: dict) -> dict:
+    """Precompute pair name -> index and index -> base token szDecimals from spot metadata"""
+    tokens = spot_meta.get("tokens", [])
+    name_to_index: Dict[str, int] = {}
+    sz_decimals: Dict[int, int] = {}
 
+    for pair in spot_meta.get("universe", []):
+        index = pair.get("index")
+        if index is None:
+            continue
+        if pair.get("name"):
+            name_to_index[pair["name"]] = index
+
+        # Size decimals come from the pair's base token
+        token_indices = pair.get("tokens", [])
+        if token_indices and token_indices[0] < len(tokens):
+            sz_decimals[index] = tokens[token_indices[0]].get("szDecimals", 6)
+
+    return {"name_to_index": name_to_index, "sz_decimals": sz_decimals}
 
-async def get_spot_asset_info(info: Info, coin_field: str) -> Optional[dict]:
-    """Get spot asset price and metadata for proper order sizing"""
-    try:
-        if coin_field.startswith("@"):
-            # For @index format, use spot API
-            spot_data = info.spot_meta_and_asset_ctxs()
-            if len(spot_data) >= 2:
-                spot_meta = spot_data[0]  # First element is metadata
-                asset_ctxs = spot_data[1]  # Second element is asset contexts
-
-                # Extract index number
-                index = int(coin_field[1:])
-                if index < len(asset_ctxs):
-                    ctx = asset_ctxs[index]
-                    # Try midPx first, fallback to markPx
-                    price = float(ctx.get("midPx", ctx.get("markPx", 0)))
-
-                    if price > 0:
-                        # Get token metadata for size decimals
-                        universe = spot_meta.get("universe", [])
-                        tokens = spot_meta.get("tokens", [])
-
-                        # Find the pair info
-                        pair_info = None
-                        for pair in universe:
-                            if pair.get("index") == index:
-                                pair_info = pair
-                                break
-
-                        # Get token info for size decimals
-                        size_decimals = 6  # Default fallback
-                        if pair_info and "tokens" in pair_info:
-                            token_indices = pair_info["tokens"]
-                            if len(token_indices) > 0:
-                                base_token_index = token_indices[0]
-                                if base_token_index < len(tokens):
-                                    token_info = tokens[base_token_index]
-                                    size_decimals = token_info.get("szDecimals", 6)
-
-                        return {
-                            "price": price,
-                            "szDecimals": size_decimals,
-                            "coin": coin_field,
-                        }
-                    else:
-                        print(
-                            f"⚠️ No spot price for {coin_field} (midPx={ctx.get('midPx')}, markPx={ctx.get('markPx')})"
-                        )
-                        return None
-                else:
-                    print(
-                        f"⚠️ Spot index {coin_field} out of range (max: @{len(asset_ctxs) - 1})"
-                    )
-                    return None
 
-        elif "/" in coin_field:
-            # For PAIR/USDC format, need to find the corresponding @index first
-            spot_meta = info.spot_meta()
-            universe = spot_meta.get("universe", [])
+async def get_spot_index(info: Info) -> dict:
+    """Spot lookup tables, rebuilt once per metadata refresh"""
+    return await _cached(
+        "spot_index", SPOT_META_TTL, lambda: build_spot_index(info.spot_meta())
+    )
+
+
+async def resolve_asset_index(info: Info, coin_field: str) -> Optional[int]:
+    """Spot pair index for "@index" or "PAIR/USDC" coin names; None if unknown"""
+    if coin_field.startswith("@"):
+        return int(coin_field[1:])
+    if "/" in coin_field:
+        return (await get_spot_index(info))["name_to_index"].get(coin_field)
+    return None
 
-            # Find the matching pair in spot universe
-            for pair_info in universe:
-                if pair_info.get("name") == coin_field:
-                    pair_index = pair_info.get("index")
-                    # Get info using the index
-                    return await get_spot_asset_info(info, f"@{pair_index}")
 
+async def get_spot_asset_info(info: Info, coin_field: str) -> Optional[dict]:
+    """Get spot asset price and metadata for proper order sizing"""
+    try:
+        index = await resolve_asset_index(info, coin_field)
+        if index is None:
             print(f"⚠️ Spot pair {coin_field} not found in universe")
             return None
 
-        else:
-            print(f"⚠️ Unsupported coin format for spot: {coin_field}")
+        spot_data = await _cached("ctxs", SPOT_CTXS_TTL, info.spot_meta_and_asset_ctxs)
+        asset_ctxs = spot_data[1]  # Second element is asset contexts
+        if index >= len(asset_ctxs):
+            print(
+                f"⚠️ Spot index {coin_field} out of range (max: @{len(asset_ctxs) - 1})"
+            )
             return None
 
+        ctx = asset_ctxs[index]
+        # Try midPx first, fallback to markPx
+        price = float(ctx.get("midPx", ctx.get("markPx", 0)))
+        if price <= 0:
+            print(
+                f"⚠️ No spot price for {coin_field} (midPx={ctx.get('midPx')}, markPx={ctx.get('markPx')})"
+            )
+            return None
+
+        spot_index = await get_spot_index(info)
+        return {
+            "price": price,
+            "szDecimals": spot_index["sz_decimals"].get(index, 6),
+            "assetIndex": index,
+            "coin": coin_field,
+        }
+
     except Exception as e:
         print(f"⚠️ Error getting spot info for {coin_field}: {e}")
         return None
 
 
 async def place_follower_twap_order(
-    exchange: Exchange, info: Info, leader_twap_data: dict, leader_combination: str
-) -> Optional[int]:
-    """Place corresponding follower TWAP order for spot trades"""
+    exchange: Exchange, info: Info, leader_twap_data: dict, leader_combination: TwapCombination
+) -> Optional[Tuple[int, float]]:
+    """Place corresponding follower TWAP order for spot trades; returns (follower_twap_id, follower_size)"""
     try:
         state = leader_twap_data.get("state", {})
-        coin_field = state.get("coin", "")
+        coin_field = state.get("coin") or ""
         side = state.get("side")  # "B" or "A"
         minutes = state.get("minutes", 1)
         randomize = state.get("randomize", False)
@@ -211,26 +299,12 @@ async def place_follower_twap_order(
             f"🔄 Placing follower TWAP: {'BUY' if is_buy else 'SELL'} {follower_total_size} {coin_field} over {minutes}min"
         )
 
-        # Get spot metadata to find asset index
         try:
-            if coin_field.startswith("@"):
-                asset_index = int(coin_field[1:])
-            elif "/" in coin_field:
-                spot_meta = info.spot_meta()
-                universe = spot_meta.get("universe", [])
-                asset_index = None
-                for pair_info in universe:
-                    if pair_info.get("name") == coin_field:
-                        asset_index = pair_info.get("index")
-                        break
-                if asset_index is None:
-                    print(f"❌ Could not find asset index for {coin_field}")
-                    return None
-            else:
-                print(f"❌ Unsupported coin format for TWAP: {coin_field}")
-                return None
+            # Resolved once by get_spot_asset_info above
+            asset_index = asset_info["assetIndex"]
 
-            # Prepare TWAP action
+            # Prepare TWAP action (field order is part of the signed msgpack payload, so the
+            # dict is built in full here rather than patched from a cached template)
             twap_action = {
                 "type": "twapOrder",
                 "twap": {
@@ -244,21 +318,7 @@ async def place_follower_twap_order(
             }
 
             # Sign and send TWAP order
-            timestamp = get_timestamp_ms()
-            signature = sign_l1_action(
-                exchange.wallet,
-                twap_action,
-                exchange.vault_address,
-                timestamp,
-                exchange.expires_after,
-                False,
-            )
-
-            result = exchange._post_action(
-                twap_action,
-                signature,
-                timestamp,
-            )
+            result = await post_action(exchange, twap_action)
 
             if result and result.get("status") == "ok":
                 response_data = result.get("response", {}).get("data", {})
@@ -269,13 +329,16 @@ async def place_follower_twap_order(
                     print(f"✅ Follower TWAP placed! ID: {follower_twap_id}")
 
                     # Track the follower TWAP combination to filter it from future messages
+                    follower_key = (coin_field, side, minutes, randomize)
+                    follower_sizes: Set[float] = follower_twap_combinations.get(follower_key) or set()
+                    follower_sizes.add(follower_total_size)
+                    follower_twap_combinations[follower_key] = follower_sizes
                     follower_combination = create_follower_twap_combination(
                         coin_field, side, minutes, randomize, follower_total_size
                     )
-                    follower_twap_combinations.add(follower_combination)
-                    print(f"Tracking follower combination: {follower_combination}")
+                    print(f"Tracking follower combination: {format_combination(follower_combination)}")
 
-                    return follower_twap_id
+                    return follower_twap_id, follower_total_size
                 else:
                     print(f"⚠️ Unexpected TWAP status: {status_info}")
 
@@ -300,21 +363,9 @@ async def cancel_follower_twap_order(
 
         # Get asset index for cancellation
         try:
-            if coin_field.startswith("@"):
-                asset_index = int(coin_field[1:])
-            elif "/" in coin_field:
-                spot_meta = info.spot_meta()
-                universe = spot_meta.get("universe", [])
-                asset_index = None
-                for pair_info in universe:
-                    if pair_info.get("name") == coin_field:
-                        asset_index = pair_info.get("index")
-                        break
-                if asset_index is None:
-                    print(f"❌ Could not find asset index for TWAP cancel {coin_field}")
-                    return False
-            else:
-                print(f"❌ Unsupported coin format for TWAP cancel: {coin_field}")
+            asset_index = await resolve_asset_index(info, coin_field)
+            if asset_index is None:
+                print(f"❌ Could not find asset index for TWAP cancel {coin_field}")
                 return False
 
             # Prepare TWAP cancellation action
@@ -325,21 +376,7 @@ async def cancel_follower_twap_order(
             }
 
             # Sign and send TWAP cancellation
-            timestamp = get_timestamp_ms()
-            signature = sign_l1_action(
-                exchange.wallet,
-                twap_cancel_action,
-                exchange.vault_address,
-                timestamp,
-                exchange.expires_after,
-                False,
-            )
-
-            result = exchange._post_action(
-                twap_cancel_action,
-                signature,
-                timestamp,
-            )
+            result = await post_action(exchange, twap_cancel_action)
 
             if result and result.get("status") == "ok":
                 response_data = result.get("response", {}).get("data", {})
@@ -369,86 +406,93 @@ async def handle_leader_twap_events(data: dict, exchange: Exchange, info: Info):
     """Process leader's TWAP-related WebSocket events"""
     channel = data.get("channel")
 
-    if channel == "user":
-        user_data = data.get("data", {})
+    if channel == "subscriptionResponse":
+        print("✅ WebSocket subscription confirmed")
+        return
 
-        # Handle TWAP orders - mirror them
-        for twap_event in user_data.get("twapHistory", []):
-            state = twap_event.get("state", {})
-            coin_field = state.get("coin", "")
+    if channel != "userTwapHistory":
+        return
 
-            if not is_spot_order(coin_field):
-                continue
+    twap_data = data.get("data", {})
+    # The first message replays the leader's past TWAPs - nothing in it is new
+    if twap_data.get("isSnapshot"):
+        return
+    twap_events = twap_data.get("history", [])
 
-            # Create TWAP combination ID with size for precise tracking
-            leader_combination = create_leader_twap_combination(state)
-            twap_status = twap_event.get("status", {}).get("status", "unknown")
+    # Handle TWAP orders - mirror them
+    for twap_event in twap_events:
+        state = twap_event.get("state", {})
+        coin_field = state.get("coin") or ""
 
-            print(
-                f"TWAP {twap_status.upper()}: {state.get('side')} {state.get('sz')} {coin_field} (Leader: {leader_combination})"
-            )
+        if not is_spot_order(coin_field):
+            continue
 
-            # Check if this is our own follower TWAP - skip processing
-            # We need to create potential follower combination to check
-            try:
-                side = state.get("side")
-                minutes = state.get("minutes", 1)
-                randomize = state.get("randomize", False)
-                current_size = float(state.get("sz", "0"))
+        # Create TWAP combination ID with size for precise tracking
+        leader_combination = create_leader_twap_combination(state)
+        twap_status = twap_event.get("status", {}).get("status", "unknown")
+
+        print(
+            f"TWAP {twap_status.upper()}: {state.get('side')} {state.get('sz')} {coin_field} (Leader: {format_combination(leader_combination)})"
+        )
 
+        # Check if this is our own follower TWAP - skip processing
+        # We need to create potential follower combination to check
+        try:
+            side = state.get("side")
+            minutes = state.get("minutes", 1)
+            randomize = state.get("randomize", False)
+            current_size = float(state.get("sz", "0"))
+
+            follower_sizes = follower_twap_combinations.get((coin_field, side, minutes, randomize))
+            if follower_sizes and current_size in follower_sizes:
                 potential_follower_combination = create_follower_twap_combination(
                     coin_field, side, minutes, randomize, current_size
                 )
+                print(f"DEBUG: Skipping our own follower TWAP: {format_combination(potential_follower_combination)}")
+                continue
+        except (ValueError, TypeError):
+            pass  # Continue processing if size conversion fails
 
-                if potential_follower_combination in follower_twap_combinations:
-                    print(f"DEBUG: Skipping our own follower TWAP: {potential_follower_combination}")
-                    continue
-            except (ValueError, TypeError):
-                pass  # Continue processing if size conversion fails
-
-            if twap_status == "activated":
-                # Skip if we already processed this leader TWAP combination
-                if leader_combination in leader_twap_combinations:
-                    print(f"DEBUG: Skipping already processed leader TWAP: {leader_combination}")
-                    continue
-
-                # Mark this combination as processed to avoid duplicates
-                leader_twap_combinations.add(leader_combination)
-
-                # New TWAP order placed - attempt to mirror it
-                try:
-                    follower_twap_id = await place_follower_twap_order(
-                        exchange, info, twap_event, leader_combination
-                    )
-                    if follower_twap_id:
-                        twap_mappings[leader_combination] = follower_twap_id
-                        print(f"Mapped leader TWAP {leader_combination} -> follower ID {follower_twap_id}")
-                except Exception as e:
-                    print(f"Error mirroring TWAP {leader_combination}: {e}")
-
-            elif twap_status in ["canceled", "terminated"]:
-                # TWAP cancelled/terminated - cancel corresponding follower TWAP
-                if leader_combination in twap_mappings:
-                    follower_twap_id = twap_mappings[leader_combination]
-                    await cancel_follower_twap_order(
-                        exchange, info, follower_twap_id, coin_field
-                    )
-                    del twap_mappings[leader_combination]
-                    # Remove from processed combinations so it can be placed again later
-                    leader_twap_combinations.discard(leader_combination)
-
-                    # Also remove corresponding follower combination from tracking
-                    # Find and remove the follower combination
-                    to_remove = None
-                    for follower_combo in follower_twap_combinations:
-                        if follower_combo.startswith(f"{coin_field}_{state.get('side')}_{state.get('minutes')}_{state.get('randomize', False)}_"):
-                            to_remove = follower_combo
-                            break
-                    if to_remove:
-                        follower_twap_combinations.discard(to_remove)
-
-    elif channel == "subscriptionResponse":
-        print("✅ WebSocket subscription confirmed")
+        if twap_status == "activated":
+            # Skip if we already processed this leader TWAP combination
+            if leader_combination in leader_twap_combinations:
+                print(f"DEBUG: Skipping already processed leader TWAP: {format_combination(leader_combination)}")
+                continue
+
+            # Mark this combination as processed to avoid duplicates
+            leader_twap_combinations.add(leader_combination)
+
+            # New TWAP order placed - attempt to mirror it
+            try:
+                follower_twap = await place_follower_twap_order(
+                    exchange, info, twap_event, leader_combination
+                )
+                if follower_twap:
+                    twap_mappings[leader_combination] = follower_twap
+                    follower_twap_id = follower_twap[0]
+                    print(f"Mapped leader TWAP {format_combination(leader_combination)} -> follower ID {follower_twap_id}")
+            except Exception as e:
+                print(f"Error mirroring TWAP {format_combination(leader_combination)}: {e}")
+
+        elif twap_status in ["canceled", "terminated"]:
+            # TWAP cancelled/terminated - cancel corresponding follower TWAP
+            if leader_combination in twap_mappings:
+                follower_twap_id, follower_size = twap_mappings[leader_combination]
+                await cancel_follower_twap_order(
+                    exchange, info, follower_twap_id, coin_field
+                )
+                del twap_mappings[leader_combination]
+                # Remove from processed combinations so it can be placed again later
+                leader_twap_combinations.discard(leader_combination)
+
+                # Stop tracking only this follower's size; other follower TWAPs with the
+                # same coin/side/minutes/randomize keep being filtered
+                follower_key = (coin_field, state.get("side"), state.get("minutes", 1), state.get("randomize", False))
+                follower_sizes = follower_twap_combinations.get(follower_key)
+                if follower_sizes is not None:
+                    follower_sizes.discard(follower_size)
+                    if not follower_sizes:
+                        follower_twap_combinations.pop(follower_key)
 
 
 async def monitor_and_mirror_spot_twap_orders():
@@ -463,8 +507,11 @@ async def monitor_and_mirror_spot_twap_orders():
     # Initialize follower trading components
     try:
         wallet = Account.from_key(private_key)
-        exchange = Exchange(wallet, BASE_URL)
-        info = Info(BASE_URL, skip_ws=True)
+        # Both constructors fetch metadata over blocking HTTP - run them in threads concurrently
+        exchange, info = await asyncio.gather(
+            asyncio.to_thread(Exchange, wallet, BASE_URL),
+            asyncio.to_thread(Info, BASE_URL, skip_ws=True),
+        )
         print(f"✅ Follower wallet initialized: {wallet.address}")
     except Exception as e:
         print(f"❌ Failed to initialize follower wallet: {e}")
@@ -477,13 +524,13 @@ async def monitor_and_mirror_spot_twap_orders():
         async with websockets.connect(WS_URL) as websocket:
             print("✅ WebSocket connected!")
 
-            # Subscribe to leader's user events (TWAP orders)
+            # Subscribe to leader's TWAP history only, so fills and perp events aren't shipped
             events_subscription = {
                 "method": "subscribe",
-                "subscription": {"type": "userEvents", "user": LEADER_ADDRESS},
+                "subscription": {"type": "userTwapHistory", "user": LEADER_ADDRESS},
             }
 
-            await websocket.send(json.dumps(events_subscription))
+            await websocket.send(orjson.dumps(events_subscription), text=True)
 
             print(f"📊 Monitoring SPOT TWAP orders for leader: {LEADER_ADDRESS}")
             print(f"💰 Fixed TWAP value: ${FIXED_ORDER_VALUE_USDC} USDC per TWAP")
@@ -500,9 +547,23 @@ async def monitor_and_mirror_spot_twap_orders():
                         break
                     await message_queue.put(message)
 
+            def sweep_tracking():
+                """Forget tracked TWAPs old enough to have finished"""
+                removed = sum(
+                    container.sweep()
+                    for container in (leader_twap_combinations, follower_twap_combinations, twap_mappings)
+                )
+                if removed:
+                    print(f"🧹 Dropped {removed} expired TWAP tracking entries")
+
             # Task to process messages one by one from queue
             async def message_processor():
+                last_sweep = time.monotonic()
                 while running:
+                    if time.monotonic() - last_sweep >= TRACKING_SWEEP_INTERVAL:
+                        sweep_tracking()
+                        last_sweep = time.monotonic()
+
                     try:
                         # Wait for next message with timeout
                         message = await asyncio.wait_for(
@@ -510,14 +571,14 @@ async def monitor_and_mirror_spot_twap_orders():
                         )
 
                         try:
-                            data = json.loads(message)
+                            data = orjson.loads(message)
 
-                            # print(f"RAW MESSAGE: {json.dumps(data, indent=2)}")
+                            # print(f"RAW MESSAGE: {orjson.dumps(data, option=orjson.OPT_INDENT_2)}")
                             # print("-" * 40)
 
                             # Process message completely before moving to next
                             await handle_leader_twap_events(data, exchange, info)
-                        except json.JSONDecodeError:
+                        except orjson.JSONDecodeError:
                             print("⚠️ Received invalid JSON")
                         except Exception as e:
                             print(f"❌ Error processing message: {e}")
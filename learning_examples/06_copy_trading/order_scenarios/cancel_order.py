@@ -43,13 +43,14 @@ async def cancel_spot_order():
             print("💡 Run place_order.py first to create an order")
             return
 
-        # Find the first spot order
-        spot_order = None
-        for order in open_orders:
-            coin = order.get("coin", "")
-            if coin.startswith("@") or "/" in coin:  # Spot order indicators
-                spot_order = order
-                break
+        # Find the first spot order ("@index" or "PAIR/USDC" coin)
+        spot_order = next(
+            (
+                order for order in open_orders
+                if (coin := order.get("coin") or "")[:1] == "@" or "/" in coin
+            ),
+            None,
+        )
 
         if not spot_order:
             print("❌ No spot orders found to cancel")
@@ -42,12 +42,11 @@ async def cancel_multiple_spot_orders():
             print("💡 Run place_order.py multiple times to create orders")
             return
 
-        # Find all spot orders
-        spot_orders = []
-        for order in open_orders:
-            coin = order.get("coin", "")
-            if coin.startswith("@") or "/" in coin:  # Spot order indicators
-                spot_orders.append(order)
+        # Find all spot orders ("@index" or "PAIR/USDC" coins)
+        spot_orders = [
+            order for order in open_orders
+            if (coin := order.get("coin") or "")[:1] == "@" or "/" in coin
+        ]
 
         if not spot_orders:
             print("❌ No spot orders found to cancel")
@@ -56,30 +55,40 @@ async def cancel_multiple_spot_orders():
 
         print(f"🎯 Found {len(spot_orders)} spot orders to cancel:")
 
-        # Cancel each order individually
+        for order in spot_orders:
+            side = "BUY" if order.get("side") == "B" else "SELL"
+            print(
+                f"   Cancelling ID {order.get('oid')}: {side} {order.get('sz')} {order.get('coin')} @ ${order.get('limitPx')}"
+            )
+
+        # Cancel all orders with a single signed action (one round trip instead of one per order)
         successful_cancels = 0
         failed_cancels = 0
 
-        for order in spot_orders:
+        try:
+            result = exchange.bulk_cancel(
+                [{"coin": order["coin"], "oid": order["oid"]} for order in spot_orders]
+            )
+        except Exception as e:
+            print(f"   ❌ Bulk cancel error: {e}")
+            result = None
+
+        statuses = []
+        if result and result.get("status") == "ok":
+            statuses = result.get("response", {}).get("data", {}).get("statuses", [])
+        elif result is not None:
+            print(f"   ❌ Bulk cancel failed: {result}")
+
+        # Statuses are returned in the same order as the cancel requests
+        for i, order in enumerate(spot_orders):
             order_id = order.get("oid")
-            coin_field = order.get("coin")
-            side = "BUY" if order.get("side") == "B" else "SELL"
-            size = order.get("sz")
-            price = order.get("limitPx")
-
-            print(f"   Cancelling ID {order_id}: {side} {size} {coin_field} @ ${price}")
-
-            try:
-                result = exchange.cancel(name=coin_field, oid=order_id)
-
-                if result and result.get("status") == "ok":
-                    print(f"   ✅ Order {order_id} cancelled successfully")
-                    successful_cancels += 1
-                else:
-                    print(f"   ❌ Order {order_id} cancel failed: {result}")
-                    failed_cancels += 1
-            except Exception as e:
-                print(f"   ❌ Order {order_id} cancel error: {e}")
+            status = statuses[i] if i < len(statuses) else None
+            if status == "success":
+                print(f"   ✅ Order {order_id} cancelled successfully")
+                successful_cancels += 1
+            else:
+                if status is not None:
+                    print(f"   ❌ Order {order_id} cancel failed: {status}")
                 failed_cancels += 1
 
         print(f"📋 Cancel Summary:")
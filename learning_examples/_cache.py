@@ -0,0 +1,66 @@
+"""
+示例脚本共享的缓存组件。
+
+- 磁盘缓存：meta/spotMeta只在上新/下架时变化，跨运行缓存到 ~/.cache/hyperliquid
+- 进程内缓存：按key缓存协程结果，并发的相同请求共享同一次往返
+"""
+
+import asyncio
+import hashlib
+import time
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+try:
+    import orjson
+except ImportError:
+    import json as orjson
+
+CACHE_DIR = Path("~/.cache/hyperliquid").expanduser()
+DISK_CACHE_TTL = 300  # 磁盘缓存5分钟
+
+_cache: Dict[Hashable, Tuple[float, "asyncio.Task[Any]"]] = {}
+
+
+def cache_key(base_url: Optional[str], request_type: str) -> str:
+    """磁盘缓存键：请求类型 + base_url的哈希"""
+    return f"{request_type}_{hashlib.sha1((base_url or '').encode()).hexdigest()[:16]}"
+
+
+def load_cached(key: str, ttl: float = DISK_CACHE_TTL) -> Optional[Any]:
+    """读取磁盘缓存；文件不存在、已过期或损坏时返回None"""
+    path = CACHE_DIR / f"{key}.json"
+    try:
+        if time.time() - path.stat().st_mtime < ttl:
+            return orjson.loads(path.read_bytes())
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+def save_cached(key: str, value: Any) -> None:
+    """写入磁盘缓存；写入失败时忽略"""
+    try:
+        payload = orjson.dumps(value)
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        (CACHE_DIR / f"{key}.json").write_bytes(
+            payload if isinstance(payload, bytes) else payload.encode()
+        )
+    except OSError:
+        pass
+
+
+async def cached(key: Hashable, ttl: float, fetch: Callable[[], Awaitable[Any]]) -> Any:
+    """按key缓存fetch()的结果ttl秒；并发的相同请求共享同一次往返，失败的结果不缓存"""
+    now = time.monotonic()
+    entry = _cache.get(key)
+    if entry is not None and now - entry[0] < ttl:
+        return await entry[1]
+
+    task = asyncio.ensure_future(fetch())
+    _cache[key] = (now, task)
+    try:
+        return await task
+    except Exception:
+        _cache.pop(key, None)
+        raise
@@ -0,0 +1,71 @@
+"""
+示例脚本共享的运行时组件。
+
+各目录的脚本通过 `sys.path` 引入本模块：
+- run(coro): 运行入口协程；安装了uvloop时使用uvloop事件循环（Windows上回退到默认循环）
+- get_client()/close_client(): 进程内共享的httpx客户端，同一主机的多次/info请求复用同一连接和TLS会话
+- to_pretty_json(obj): 打印SDK返回结果用的缩进JSON
+"""
+
+import asyncio
+import importlib.util
+import json
+from typing import Any, Coroutine, Optional
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
+import httpx
+
+# 并发请求在一条HTTP/2连接上多路复用；需要安装h2（pip install 'httpx[http2]'）
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+# 大的元数据响应（spotMetaAndAssetCtxs等）压缩后只有几分之一；只有安装了brotli才声明br，否则httpx无法解码
+BROTLI_AVAILABLE = any(importlib.util.find_spec(m) for m in ("brotli", "brotlicffi"))
+DEFAULT_HEADERS = {
+    "Accept-Encoding": "gzip, br" if BROTLI_AVAILABLE else "gzip",
+    "Content-Type": "application/json",
+}
+
+_client: Optional[httpx.AsyncClient] = None
+
+
+def run(coro: Coroutine[Any, Any, Any]) -> Any:
+    """运行入口协程，返回其结果"""
+    return asyncio.run(coro, loop_factory=uvloop.new_event_loop if uvloop else None)
+
+
+def to_pretty_json(obj: Any) -> str:
+    """缩进2格的JSON字符串；安装了orjson时使用orjson序列化"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode()
+    return json.dumps(obj, indent=2)
+
+
+def get_client() -> httpx.AsyncClient:
+    """返回进程内共享的httpx.AsyncClient（首次调用时创建）"""
+    global _client
+    if _client is None:
+        _client = httpx.AsyncClient(
+            timeout=10.0,
+            # 预热的连接要在SDK查询期间保持可用，空闲保活时间放宽到30秒
+            limits=httpx.Limits(
+                max_connections=100, max_keepalive_connections=64, keepalive_expiry=30.0
+            ),
+            http2=HTTP2_AVAILABLE,
+            headers=DEFAULT_HEADERS,
+        )
+    return _client
+
+
+async def close_client() -> None:
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None